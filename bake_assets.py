@@ -0,0 +1,204 @@
+import pygame as pg
+import os, json, zipfile, hashlib, argparse, struct
+from concurrent.futures import ProcessPoolExecutor
+
+# Bakes the sprites thegame.py loads into finished, pre-scaled PNGs + baked/manifest.json.
+# The game picks them up at startup (see load_sprite / SpriteAnimator), so it doesn't scale anything at runtime.
+#
+#   python bake_assets.py          # rebuild what changed
+#   python bake_assets.py --force  # rebuild everything
+
+BAKE_VERSION = 1
+OUT_DIR = "baked"
+MANIFEST = os.path.join(OUT_DIR, "manifest.json")
+
+# baked/assets.pack: every baked png as raw BGRA (= the ARGB8888 format convert_alpha gives) so the game
+# can mmap it and create surfaces straight from slices. Layout:
+#   PACK_HEADER, then per entry PACK_NAME_LEN + name (utf-8) + PACK_ENTRY, then the pixel blobs
+PACK = os.path.join(OUT_DIR, "assets.pack")
+PACK_MAGIC = b"TLGP"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<4sHI")    # magic, version, entries
+PACK_NAME_LEN = struct.Struct("<H")
+PACK_ENTRY = struct.Struct("<IIQ")      # width, height, offset of the pixels from the start of the file
+PACK_ALIGN = 64
+
+# render scales the game can run with (1 = default, 3 = --low-res)
+RENDER_SCALES = (1, 3)
+
+# (image the game loads, scale it loads it at, (rows, cols) for sprite sheets)
+ASSETS = [
+    ("sprites/house_wall_texture_exterior.png", 6, None),
+    ("sprites/interior_wall_texture.png", 6, None),
+    ("sprites/house_floor_texture.png", 6, None),
+    ("sprites/bugged_wall.png", 6, None),
+    ("sprites/bugged_floor.png", 6, None),
+    ("sprites/bedside_table_1_shelf.png", 3, None),
+    ("sprites/bedside_table_11_shelf.png", 3, None),
+    ("sprites/bedside_table_2_shelf.png", 3, None),
+    ("sprites/bedside_table_21_shelf.png", 3, None),
+    ("sprites/bedside_table_22_shelf.png", 3, None),
+    ("sprites/door.png", 3, None),
+    ("sprites/door_opened.png", 3, None),
+    ("sprites/key.png", 1, None),
+    ("sprites/lock.png", 1, None),
+    ("sprites/note_item.png", 1, None),
+    ("sprites/portal.png", 3, None),
+    ("sprites/player_idle.png", 5, (3, 2)),
+    ("sprites/player_walk.png", 5, (2, 2)),
+]
+
+# Pixelorama projects that are the real source of an exported png.
+# bugged_wall.pxo is the portal ("portal" export name), but its layers don't composite to the exported
+# sprites/portal.png exactly (semi transparent pixels differ), so the png stays the source for that one.
+PXO_SOURCES = {
+    "sprites/house_wall_texture_exterior.png": "untitled.pxo",
+    "sprites/note_item.png": "sprites/note.pxo",
+}
+
+def asset_key(path, scale, sheet=None):
+    """Same key thegame.py looks up, scale = scale on the canvas (scale / RENDER_SCALE)"""
+    key = f"{path}@{scale:g}"
+    if sheet:
+        key += f"/{sheet[0]}x{sheet[1]}"
+    return key
+
+def load_pxo(path):
+    """Composite the visible layers of the first frame of a .pxo (zip with data.json + raw RGBA layers)"""
+    with zipfile.ZipFile(path) as z:
+        data = json.loads(z.read("data.json"))
+        size = (data["size_x"], data["size_y"])
+        image = pg.Surface(size, pg.SRCALPHA)
+        for i, layer in enumerate(data["layers"]):
+            if not layer["visible"]:
+                continue
+            pixels = pg.image.frombuffer(z.read(f"image_data/frames/1/layer_{i+1}"), size, "RGBA")
+            if layer["opacity"] < 1:
+                pixels = pixels.copy()
+                pixels.set_alpha(round(layer["opacity"] * 255))
+            image.blit(pixels, (0, 0))
+    return image
+
+def load_source(path):
+    source = PXO_SOURCES.get(path, path)
+    return load_pxo(source) if source.endswith(".pxo") else pg.image.load(source)
+
+def input_hash(path, scale, render_scale, sheet):
+    h = hashlib.sha256(f"{BAKE_VERSION}|{scale}|{render_scale}|{sheet}".encode())
+    with open(PXO_SOURCES.get(path, path), "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+def trim_frames(sheet_image, rows, cols):
+    """Cut a sprite sheet into frames with transparent edges trimmed, like SpriteAnimator._load_frames"""
+    frame_width = sheet_image.get_width() // cols
+    frame_height = sheet_image.get_height() // rows
+    frames = []
+    for row in range(rows):
+        for col in range(cols):
+            frame = sheet_image.subsurface((col * frame_width, row * frame_height, frame_width, frame_height))
+            frames.append(frame.subsurface(frame.get_bounding_rect()).copy())
+    return frames
+
+def bake_one(job):
+    """Runs in a worker process, returns the manifest entry"""
+    path, scale, render_scale, sheet, digest = job
+    image = load_source(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = f"{stem}-{digest[:12]}"
+    entry = {"source": PXO_SOURCES.get(path, path), "input_hash": digest, "files": []}
+
+    if sheet:
+        # same rounding as SpriteAnimator
+        entry["world_sizes"] = []
+        for i, frame in enumerate(trim_frames(image, *sheet)):
+            entry["world_sizes"].append((int(frame.get_width()*scale), int(frame.get_height()*scale)))
+            frame = pg.transform.scale(frame, (int(frame.get_width()*scale/render_scale), int(frame.get_height()*scale/render_scale)))
+            out = os.path.join(OUT_DIR, f"{name}-{i}.png")
+            pg.image.save(frame, out)
+            entry["files"].append(out)
+    else:
+        # same rounding as load_sprite
+        if scale != render_scale:
+            image = pg.transform.scale(image, (round(image.get_width()*scale/render_scale), round(image.get_height()*scale/render_scale)))
+        out = os.path.join(OUT_DIR, f"{name}.png")
+        pg.image.save(image, out)
+        entry["files"].append(out)
+
+    return entry
+
+def read_manifest():
+    try:
+        with open(MANIFEST, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {"version": BAKE_VERSION, "assets": {}}
+    if manifest.get("version") != BAKE_VERSION:
+        return {"version": BAKE_VERSION, "assets": {}}
+    return manifest
+
+def write_pack(files):
+    """Pack the given baked pngs, pixel blobs are aligned to PACK_ALIGN bytes"""
+    images = [(name, pg.image.load(name)) for name in sorted(files)]
+
+    index_size = PACK_HEADER.size + sum(PACK_NAME_LEN.size + len(name.encode()) + PACK_ENTRY.size for name, image in images)
+    offset = -(-index_size // PACK_ALIGN) * PACK_ALIGN
+    index = [PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(images))]
+    blobs = []
+    for name, image in images:
+        raw = name.encode()
+        index.append(PACK_NAME_LEN.pack(len(raw)) + raw + PACK_ENTRY.pack(image.get_width(), image.get_height(), offset))
+        pixels = pg.image.tobytes(image, "BGRA")
+        padding = -len(pixels) % PACK_ALIGN
+        blobs.append(pixels + bytes(padding))
+        offset += len(pixels) + padding
+
+    index = b"".join(index)
+    with open(PACK + ".tmp", "wb") as f:
+        f.write(index + bytes(-len(index) % PACK_ALIGN))
+        f.writelines(blobs)
+    os.replace(PACK + ".tmp", PACK)
+
+def bake(force=False, workers=None):
+    os.makedirs(OUT_DIR, exist_ok=True)
+    old = read_manifest()["assets"]
+    assets = {}
+    jobs = []
+
+    for path, scale, sheet in ASSETS:
+        for render_scale in RENDER_SCALES:
+            key = asset_key(path, scale / render_scale, sheet)
+            digest = input_hash(path, scale, render_scale, sheet)
+            entry = old.get(key)
+            if not force and entry and entry["input_hash"] == digest and all(os.path.exists(f) for f in entry["files"]):
+                assets[key] = entry
+                continue
+            jobs.append((key, (path, scale, render_scale, sheet, digest)))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (key, job), entry in zip(jobs, pool.map(bake_one, [job for key, job in jobs])):
+                assets[key] = entry
+                print(f"baked {key}")
+
+    # drop files no entry points to anymore
+    used = {f for entry in assets.values() for f in entry["files"]}
+    for name in os.listdir(OUT_DIR):
+        path = os.path.join(OUT_DIR, name)
+        if name.endswith(".png") and path not in used:
+            os.remove(path)
+
+    with open(MANIFEST + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": BAKE_VERSION, "assets": assets}, f, indent=1, sort_keys=True)
+    os.replace(MANIFEST + ".tmp", MANIFEST)
+
+    if jobs or force or not os.path.exists(PACK):
+        write_pack(used)
+    print(f"{len(jobs)} baked, {len(assets) - len(jobs)} up to date")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bake pre-scaled sprites for thegame.py")
+    parser.add_argument("--force", action="store_true", help="rebuild everything")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes")
+    args = parser.parse_args()
+    bake(args.force, args.jobs)
@@ -0,0 +1,33 @@
+import subprocess, sys, json, argparse
+
+# Plays the generated stress room (thegame.py --stress=scale --bench=frames) for a few scales
+# and prints the mean ms of every part of the frame side by side, so you can see what grows with the room.
+#
+#   python bench_stress.py                    # scales 0.25 1 4
+#   python bench_stress.py -s 1 2 4 8 --low-res
+
+def run(scale, frames, extra):
+    out = subprocess.run([sys.executable, "thegame.py", f"--stress={scale:g}", f"--bench={frames}", *extra],
+                         capture_output=True, text=True, check=True).stdout
+    for line in reversed(out.splitlines()):
+        if line.startswith("[bench] {"):
+            return json.loads(line[len("[bench] "):])
+    raise RuntimeError(f"no benchmark result for scale {scale:g}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark thegame.py on generated stress rooms")
+    parser.add_argument("-s", "--scales", type=float, nargs="+", default=[0.25, 1, 4], help="room scales (1 = 1000 walls, 100 shelves)")
+    parser.add_argument("-f", "--frames", type=int, default=1200, help="frames per run")
+    parser.add_argument("--low-res", action="store_true", help="run the game with --low-res")
+    args = parser.parse_args()
+
+    results = {}
+    for scale in args.scales:
+        results[scale] = run(scale, args.frames, ["--low-res"] if args.low_res else [])["parts"]
+        print(f"scale {scale:g} done")
+
+    parts = list(results[args.scales[0]])
+    print(f"{'mean ms':<16}" + "".join(f"{f'x{scale:g}':>10}" for scale in args.scales))
+    for part in parts:
+        print(f"{part:<16}" + "".join(f"{results[scale][part][0]:10.3f}" for scale in args.scales))
+    print(f"{'frame':<16}" + "".join(f"{sum(mean for mean, worst in results[scale].values()):10.3f}" for scale in args.scales))
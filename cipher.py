@@ -0,0 +1,226 @@
+import numpy as np
+import sys, argparse
+
+# Cipher tools for the note puzzles: Caesar shifts through bytes.translate tables built once for all
+# 26 shifts, bulk decoding/encoding of binary, hex and decimal dumps, and puzzle notes made from plaintext
+# (item_note7 is puzzle_note("last - right", 14, ("hex", "binary"))). Files go through in chunks.
+#
+#   python cipher.py caesar -s 14 "last - right"      # zogh - fwuvh, -s -14 shifts back
+#   python cipher.py brute "zogh - fwuvh"             # all 26 shifts, most english-looking first
+#   python cipher.py solve -f note.txt                # peel binary/hex/dec layers, then brute force the shift
+#   python cipher.py puzzle "last - right" -s 14 -l hex binary
+
+CHUNK_SIZE = 1 << 20
+LOWER = b"abcdefghijklmnopqrstuvwxyz"
+UPPER = LOWER.upper()
+WHITESPACE = b" \t\n\r\v\f"
+CONTROL = bytes(c for c in range(32) if c not in WHITESPACE) + b"\x7f"
+
+# SHIFT_TABLES[n] moves every ascii letter n places forward, anything else (utf-8 bytes too) stays
+SHIFT_TABLES = [bytes.maketrans(LOWER + UPPER, LOWER[n:] + LOWER[:n] + UPPER[n:] + UPPER[:n]) for n in range(26)]
+
+# log of english letter frequencies in %, a space counts like a common letter so word breaks score too.
+# letters alone can't tell short notes apart ("last - right" vs "wlde - ctrse"), so common words add a bonus
+LETTER_SCORES = np.zeros(256)
+for letter, frequency in zip(LOWER, [8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+                                     6.7, 7.5, 1.9, 0.095, 6.0, 6.3, 9.1, 2.8, 0.98, 2.4, 0.15, 2.0, 0.074]):
+    LETTER_SCORES[letter] = LETTER_SCORES[letter - 32] = np.log(frequency)
+LETTER_SCORES[ord(" ")] = np.log(10)
+COMMON_WORDS = set(b"""the be to of and a in that have i it for not on with he as you do at this but his by from they we
+    say her she or an will my one all would there their what so up out if about who get which go me when make can like
+    time no just him know take people into year your good some could them see other than then now look only come its over
+    think also back after use two how our work well way even new want because any these give day most us is are was were
+    hello world right left up down last first key door note room game press find open""".split())
+WORD_BONUS = 2
+
+# byte -> its token in a dump, so encoding is a lookup per byte instead of formatting
+DUMP_TOKENS = {
+    2: [f"{i:08b}".encode() for i in range(256)],
+    10: [str(i).encode() for i in range(256)],
+    16: [f"{i:02X}".encode() for i in range(256)],
+}
+LAYER_BASES = {"binary": 2, "bin": 2, "dec": 10, "hex": 16}
+
+def as_bytes(data):
+    return data.encode("utf-8") if isinstance(data, str) else bytes(data)
+
+def caesar(data, shift):
+    """Shift the letters of data (str or bytes, comes back as the same type) by shift, negative shifts decode"""
+    shifted = as_bytes(data).translate(SHIFT_TABLES[shift % 26])
+    return shifted.decode("utf-8") if isinstance(data, str) else shifted
+
+def english_score(data):
+    """How english data looks, higher is better: mean log letter frequency plus a bonus per common word"""
+    data = as_bytes(data)
+    values = np.frombuffer(data, np.uint8)
+    if not len(values):
+        return 0.0
+    return LETTER_SCORES[values].mean() + WORD_BONUS * sum(word in COMMON_WORDS for word in data.lower().split())
+
+def brute_force(data):
+    """[(shift that decodes, text)] for all 26 shifts, best english score first"""
+    data = as_bytes(data)
+    candidates = [(shift, data.translate(SHIFT_TABLES[-shift % 26])) for shift in range(26)]
+    candidates.sort(key=lambda candidate: english_score(candidate[1]), reverse=True)
+    return [(shift, text.decode("utf-8", "replace")) for shift, text in candidates]
+
+def detect_bases(data):
+    """Bases (2, 10, 16) data could be a dump of bytes in, most likely first. "72 73" fits both 10 and 16"""
+    tokens = as_bytes(data).split()
+    if not tokens:
+        return []
+    digits = b"".join(tokens)
+    bases = []
+    if not digits.translate(None, b"01") and len(digits) % 8 == 0:
+        bases.append(2)
+    if digits.isdigit() and all(len(token) <= 3 for token in tokens):
+        bases.append(10)
+    if not digits.translate(None, b"0123456789abcdefABCDEF") and len(digits) % 2 == 0:
+        bases.append(16)
+    return bases
+
+def detect_base(data):
+    """2, 10 or 16 if data looks like a dump of bytes in that base, else None"""
+    bases = detect_bases(data)
+    return bases[0] if bases else None
+
+def decode_dump(data, base):
+    """Whitespace separated bytes written in base 2, 10 or 16 -> bytes"""
+    data = as_bytes(data)
+    if base == 16:
+        return bytes.fromhex(data.decode("ascii"))
+    if base == 10:
+        return bytes(map(int, data.split()))
+    if base == 2:
+        bits = np.frombuffer(data.translate(None, WHITESPACE), np.uint8) - ord("0")
+        if len(bits) % 8 or (bits > 1).any():
+            raise ValueError("binary dump has to be whole bytes of 0 and 1")
+        return np.packbits(bits).tobytes()
+    raise ValueError(f"no dumps in base {base}")
+
+def encode_dump(data, base):
+    """bytes -> dump in base 2, 10 or 16, one space between bytes (hex is upper case like the notes)"""
+    return b" ".join(map(DUMP_TOKENS[base].__getitem__, as_bytes(data)))
+
+def puzzle_note(plaintext, shift, layers=()):
+    """Note text for a puzzle: plaintext Caesar shifted by shift, then dumped once per layer ("binary", "hex", "dec")"""
+    data = caesar(as_bytes(plaintext), shift)
+    for layer in layers:
+        data = encode_dump(data, LAYER_BASES[layer])
+    return data.decode("utf-8")
+
+def solve(data, max_layers=8):
+    """
+    Undo puzzle_note without knowing how it was made: ([layer names outermost first], brute_force of the rest).
+    A dump that fits more than one base is peeled each way and the most english result wins.
+    """
+    data = as_bytes(data).strip()
+    names = {2: "binary", 10: "dec", 16: "hex"}
+    best = None
+    for base in detect_bases(data) if max_layers else []:
+        try:
+            inner = decode_dump(data, base).strip()
+        except ValueError:
+            continue
+        if len(inner.translate(None, CONTROL)) < len(inner): # wrong base, every layer decodes to text
+            continue
+        layers, candidates = solve(inner, max_layers - 1)
+        if best is None or english_score(candidates[0][1]) > english_score(best[1][0][1]):
+            best = [names[base]] + layers, candidates
+    return best or ([], brute_force(data))
+
+# --- Streaming ---
+def read_chunks(src, chunk_size=CHUNK_SIZE):
+    """Binary file -> chunks of bytes"""
+    while chunk := src.read(chunk_size):
+        yield chunk
+
+def caesar_stream(chunks, shift):
+    """Caesar works byte by byte, so chunks can be shifted on their own"""
+    table = SHIFT_TABLES[shift % 26]
+    for chunk in chunks:
+        yield chunk.translate(table)
+
+def decode_dump_stream(chunks, base):
+    """Decode a dump that comes in chunks, a token cut at the end of a chunk waits for the next one"""
+    rest = b""
+    for chunk in chunks:
+        data = rest + chunk
+        cut = max(data.rfind(c) for c in WHITESPACE) + 1 # last whitespace, everything after it may go on
+        if base == 2 and cut == 0:
+            cut = len(data) - len(data) % 8 # binary dumps don't need spaces
+        data, rest = data[:cut], data[cut:]
+        if data.strip():
+            yield decode_dump(data, base)
+    if rest.strip():
+        yield decode_dump(rest, base)
+
+def encode_dump_stream(chunks, base):
+    first = True
+    for chunk in chunks:
+        if chunk:
+            yield (b"" if first else b" ") + encode_dump(chunk, base)
+            first = False
+
+def write_stream(chunks, dst):
+    for chunk in chunks:
+        dst.write(chunk)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Caesar and byte dump tools for the note puzzles")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help in [("caesar", "shift letters"), ("brute", "try all 26 shifts"), ("decode", "decode a binary/hex/dec dump"),
+                       ("encode", "write bytes as a dump"), ("solve", "peel dump layers, then brute force the shift")]:
+        command = commands.add_parser(name, help=help)
+        command.add_argument("text", nargs="?", help="text to work on, stdin or --file when missing")
+        command.add_argument("-f", "--file", help="read this file in chunks instead")
+        if name == "caesar":
+            command.add_argument("-s", "--shift", type=int, required=True, help="letters to shift, negative decodes")
+        if name in ("decode", "encode"):
+            command.add_argument("-b", "--base", choices=sorted(LAYER_BASES), help="dump format, decode guesses it when missing")
+        if name == "brute":
+            command.add_argument("-n", "--top", type=int, default=26, help="how many shifts to print")
+    puzzle = commands.add_parser("puzzle", help="make a puzzle note from plaintext")
+    puzzle.add_argument("text")
+    puzzle.add_argument("-s", "--shift", type=int, default=0, help="Caesar shift")
+    puzzle.add_argument("-l", "--layers", nargs="*", default=[], choices=sorted(LAYER_BASES), help="dumps on top, innermost first")
+    args = parser.parse_args()
+
+    if args.command == "puzzle":
+        data = caesar(args.text, args.shift)
+        print(f"text: {args.text}")
+        print(f"shifted text: {data}")
+        for layer in args.layers:
+            data = puzzle_note(data, 0, [layer])
+            print(f"{layer}: {data}")
+        sys.exit()
+
+    src = open(args.file, "rb") if args.file else None
+    chunks = [args.text.encode("utf-8")] if args.text is not None else read_chunks(src or sys.stdin.buffer)
+    out = sys.stdout.buffer
+    if args.command in ("solve", "brute"):
+        out = None
+    elif args.command == "caesar":
+        write_stream(caesar_stream(chunks, args.shift), out)
+    elif args.command == "encode":
+        write_stream(encode_dump_stream(chunks, LAYER_BASES[args.base or "hex"]), out)
+    elif args.command == "decode":
+        if args.base:
+            write_stream(decode_dump_stream(chunks, LAYER_BASES[args.base]), out)
+        else:
+            data = b"".join(chunks)
+            base = detect_base(data)
+            if base is None:
+                sys.exit("doesn't look like a binary, hex or dec dump, try --base")
+            out.write(decode_dump(data, base))
+    if out:
+        out.write(b"\n")
+    if args.command == "solve":
+        layers, candidates = solve(b"".join(chunks))
+        print("layers: " + (" -> ".join(layers) or "none"))
+        print(f"shift {candidates[0][0]}: {candidates[0][1]}")
+    elif args.command == "brute":
+        for shift, text in brute_force(b"".join(chunks))[:args.top]:
+            print(f"{shift:2}: {text}")
+    if src:
+        src.close()
@@ -0,0 +1,129 @@
+import pygame as pg
+import numpy as np
+import time, argparse
+
+# Glitch post-effect for the bugged level (level 4): sliding rows, red/blue channel split and noise blocks,
+# done on whole numpy arrays through pygame.surfarray. Everything random comes from tables built once.
+#
+#   python glitch.py        # benchmark against the naive per-pixel version at 1920x1080
+
+class GlitchEffect:
+    def __init__(self, frames=64, scale=1, seed=7):
+        """
+        frames: how many different glitch frames are precomputed before they repeat
+        scale: surface pixels per world pixel (1 / RENDER_SCALE on the low-res canvas)
+        """
+        rng = np.random.default_rng(seed)
+        self.frames = []
+        for i in range(frames):
+            if rng.random() < 0.3:
+                self.frames.append(([], None, [])) # calm frame, so it flickers instead of crawling
+                continue
+            # (start as a fraction of the area height, height px, shift px)
+            bands = [(rng.random(), rng.integers(4, 60) * scale, rng.integers(-80, 80) * scale) for _ in range(rng.integers(1, 6))]
+            # (start, height as fractions of the area height, how far red and blue move apart px)
+            split = (rng.random() * 0.8, rng.uniform(0.05, 0.2), max(1, int(rng.integers(3, 12) * scale)))
+            # (x, y as fractions of the area, width px, height px, where in the noise table)
+            blocks = [(rng.random(), rng.random(), rng.integers(40, 200) * scale, rng.integers(6, 40) * scale, rng.integers(0, 56), rng.integers(0, 216))
+                      for _ in range(rng.integers(0, 4))]
+            self.frames.append((bands, split, blocks))
+        self.noise = rng.integers(0, 256, (256, 256, 3), np.uint8) # blocks are cut out of this, (x, y, rgb) like surfarray
+
+    def _frame(self, frame, w, h):
+        """The table entry of frame in pixels of a w x h area: [(y0, y1, shift)], (y0, y1, dx) or None, [(x0, y0, x1, y1, nx, ny)]"""
+        bands, split, blocks = self.frames[frame % len(self.frames)]
+        rows = []
+        for start, height, shift in bands:
+            y0 = int(start * h)
+            rows.append((y0, min(h, y0 + max(1, int(height))), int(shift)))
+        if split is not None:
+            y0 = int(split[0] * h)
+            split = (y0, min(h, y0 + max(1, int(split[1] * h))), min(split[2], w - 1))
+        rects = []
+        for x, y, bw, bh, nx, ny in blocks:
+            x0, y0 = int(x * w), int(y * h)
+            x1, y1 = min(w, x0 + max(1, int(bw))), min(h, y0 + max(1, int(bh)))
+            rects.append((x0, y0, x1, y1, nx, ny))
+        return rows, split, rects
+
+    def apply(self, surface, area, frame):
+        """Glitch the area (Rect, clipped to surface) of surface in place, frame picks the table entry"""
+        area = area.clip(surface.get_rect())
+        if area.width < 2 or area.height < 2:
+            return
+        rows, split, rects = self._frame(frame, area.width, area.height)
+        pixels = pg.surfarray.pixels3d(surface.subsurface(area)) # (w, h, rgb) view, locks the surface until deleted
+
+        for y0, y1, shift in rows:
+            pixels[:, y0:y1] = np.roll(pixels[:, y0:y1], shift, axis=0)
+        if split is not None:
+            y0, y1, dx = split
+            pixels[dx:, y0:y1, 0] = pixels[:-dx, y0:y1, 0].copy()
+            pixels[:-dx, y0:y1, 2] = pixels[dx:, y0:y1, 2].copy()
+        for x0, y0, x1, y1, nx, ny in rects:
+            pixels[x0:x1, y0:y1] = self.noise[nx:nx + x1 - x0, ny:ny + y1 - y0]
+        del pixels
+
+    def apply_naive(self, surface, area, frame):
+        """Same result as apply(), one pixel at a time with get_at/set_at. Only here to benchmark against"""
+        area = area.clip(surface.get_rect())
+        if area.width < 2 or area.height < 2:
+            return
+        rows, split, rects = self._frame(frame, area.width, area.height)
+        w = area.width
+
+        for y0, y1, shift in rows:
+            for y in range(y0, y1):
+                row = [surface.get_at((area.x + x, area.y + y)) for x in range(w)]
+                for x in range(w):
+                    surface.set_at((area.x + (x + shift) % w, area.y + y), row[x])
+        if split is not None:
+            y0, y1, dx = split
+            for y in range(y0, y1):
+                row = [surface.get_at((area.x + x, area.y + y)) for x in range(w)]
+                for x in range(w):
+                    r, g, b = row[x - dx].r if x >= dx else row[x].r, row[x].g, row[x + dx].b if x < w - dx else row[x].b
+                    surface.set_at((area.x + x, area.y + y), (r, g, b))
+        for x0, y0, x1, y1, nx, ny in rects:
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    surface.set_at((area.x + x, area.y + y), tuple(int(c) for c in self.noise[nx + x - x0, ny + y - y0]))
+
+def benchmark(size=(1920, 1080), frames=240, naive_frames=2):
+    surface = pg.Surface(size)
+    gradient = np.zeros((size[0], size[1], 3), np.uint8)
+    gradient[..., 0] = np.linspace(0, 255, size[0])[:, None]
+    gradient[..., 1] = np.linspace(0, 255, size[1])[None, :]
+    gradient[..., 2] = 128
+    pg.surfarray.blit_array(surface, gradient)
+    effect = GlitchEffect()
+    area = surface.get_rect()
+
+    # both versions have to produce the same image
+    glitched = [surface.copy(), surface.copy()]
+    noisy_frame = next(i for i, f in enumerate(effect.frames) if f[0])
+    effect.apply(glitched[0], area, noisy_frame)
+    effect.apply_naive(glitched[1], area, noisy_frame)
+    same = np.array_equal(pg.surfarray.array3d(glitched[0]), pg.surfarray.array3d(glitched[1]))
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        effect.apply(surface, area, frame)
+    vectorised = (time.perf_counter() - start) * 1000 / frames
+
+    start = time.perf_counter()
+    for frame in range(naive_frames):
+        effect.apply_naive(surface, area, frame)
+    naive = (time.perf_counter() - start) * 1000 / naive_frames
+
+    print(f"{size[0]}x{size[1]}, same output: {same}")
+    print(f"vectorised {vectorised:8.3f} ms/frame ({frames} frames)")
+    print(f"naive      {naive:8.3f} ms/frame ({naive_frames} frames)")
+    print(f"{naive / vectorised:.0f}x faster, {1000 / 60 - vectorised:.2f} ms of a 60 fps frame left")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the level 4 glitch effect")
+    parser.add_argument("-f", "--frames", type=int, default=240, help="frames for the vectorised version")
+    parser.add_argument("-n", "--naive-frames", type=int, default=2, help="frames for the naive version")
+    args = parser.parse_args()
+    benchmark(frames=args.frames, naive_frames=args.naive_frames)
@@ -1,5 +1,517 @@
 import pygame as pg
-import sys, re, textwrap, requests
+import numpy as np
+from glitch import GlitchEffect
+from cipher import puzzle_note
+from particles import ParticleSystem, PORTAL_PARTICLES, PORTAL_RATE, DOOR_PARTICLES, DOOR_BURST
+from bake_assets import MANIFEST, asset_key, input_hash, PACK, PACK_MAGIC, PACK_VERSION, PACK_HEADER, PACK_NAME_LEN, PACK_ENTRY
+import sys, os, re, ast, json, mmap, hashlib, weakref, struct, zlib, threading, queue, collections, concurrent.futures, cProfile, tracemalloc, random, time, requests
+
+# --- MemoryTracker class ---
+
+class MemoryTracker:
+    def __init__(self, enabled=False, soak_seconds=0):
+        """
+        enabled (--memory): count live Surface bytes per tag and diff tracemalloc snapshots on every room transition.
+        soak_seconds (--soak[=seconds]): play the game headless with random input and fail if memory keeps growing.
+        """
+        self.enabled = enabled or soak_seconds > 0
+        self.soak_seconds = soak_seconds
+        self.surface_bytes = {} # tag -> bytes of live surfaces
+        self.surface_count = {} # tag -> live surfaces
+        self.room = None
+        self.snapshot = None
+        self.samples = []
+        self.sample_every = min(600, max(30, soak_seconds * 3)) # frames, 20 samples for short soaks, one every 10 s past 200 s (--soak=3600: 360)
+        self.soak_keys = []
+        self.rng = random.Random(1234)
+        if self.enabled:
+            tracemalloc.start()
+
+    def track(self, surface, tag):
+        """Count surface under tag until it's garbage collected, returns the surface so it can wrap a return value"""
+        if not self.enabled:
+            return surface
+        size = surface.get_pitch() * surface.get_height()
+        self.surface_bytes[tag] = self.surface_bytes.get(tag, 0) + size
+        self.surface_count[tag] = self.surface_count.get(tag, 0) + 1
+        weakref.finalize(surface, self._untrack, tag, size)
+        return surface
+
+    def _untrack(self, tag, size):
+        self.surface_bytes[tag] -= size
+        self.surface_count[tag] -= 1
+
+    def report(self):
+        return ", ".join(f"{tag}: {self.surface_count[tag]} surf {b / 2**20:.1f} MB" for tag, b in sorted(self.surface_bytes.items()))
+
+    def update(self, room):
+        """Call once per frame, prints a tracemalloc diff whenever the room changes"""
+        if not self.enabled or room == self.room:
+            return
+        self.room = room
+        snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        print(f"[memory] entered room {room}: {self.report()}")
+        if self.snapshot is not None:
+            for stat in snapshot.compare_to(self.snapshot, "lineno")[:5]:
+                print(f"[memory]   {stat}")
+        self.snapshot = snapshot
+
+    # --- soak test ---
+
+    def soak_input(self, frame):
+        """Random key presses, every half second release the held key and press a new one"""
+        if frame % 30:
+            return
+        for key in self.soak_keys:
+            pg.event.post(pg.event.Event(pg.KEYUP, key=key))
+        key = self.rng.choice([pg.K_w, pg.K_a, pg.K_s, pg.K_d, pg.K_w, pg.K_a, pg.K_s, pg.K_d,
+                               pg.K_UP, pg.K_RIGHT, pg.K_DOWN, pg.K_LEFT, pg.K_e])
+        pg.event.post(pg.event.Event(pg.KEYDOWN, key=key))
+        self.soak_keys = [key]
+
+    def soak_sample(self, now, containers):
+        """containers: name -> sized object that must not keep growing"""
+        sample = {"python": tracemalloc.get_traced_memory()[0], "surfaces": sum(self.surface_bytes.values())}
+        sample.update((name, len(obj)) for name, obj in containers.items())
+        self.samples.append((now, sample))
+
+    def soak_result(self):
+        """Compare the last sample with the one after warm-up (first quarter), returns a list of failures"""
+        if len(self.samples) < 4:
+            return ["not enough samples"]
+        _, warm = self.samples[len(self.samples) // 4]
+        _, last = self.samples[-1]
+        failures = []
+        for name, before in warm.items():
+            after = last[name]
+            # memory may wobble a bit, containers only by the handful of items/notes the rooms have
+            allowed = before * 0.1 + 2**20 if name in ("python", "surfaces") else 16
+            if after - before > allowed:
+                failures.append(f"{name} grew from {before} to {after}")
+        return failures
+
+def parse_soak_seconds(argv):
+    for arg in argv:
+        if arg == "--soak":
+            return 3600
+        if arg.startswith("--soak="):
+            return int(arg.split("=", 1)[1])
+    return 0
+
+memory_tracker = MemoryTracker("--memory" in sys.argv, parse_soak_seconds(sys.argv))
+
+# --- FrameTimer class ---
+
+class FrameTimer:
+    def __init__(self, frames=0):
+        """
+        frames (--bench[=frames]): time every part of the frame (the mark() calls in the game loop),
+        play headless with scripted input, quit after frames and print mean/worst ms per part.
+        """
+        self.frames = frames
+        self.totals = {} # part -> seconds
+        self.worst = {} # part -> seconds
+        self.last = 0
+        self.counted = 0
+
+    def start(self):
+        if self.frames:
+            self.last = time.perf_counter()
+            self.counted += 1
+
+    def mark(self, part):
+        """Everything since the previous mark (or start) is counted as part"""
+        if not self.frames:
+            return
+        now = time.perf_counter()
+        took = now - self.last
+        self.totals[part] = self.totals.get(part, 0) + took
+        if took > self.worst.get(part, 0):
+            self.worst[part] = took
+        self.last = now
+
+    def bench_input(self, frame):
+        """Walk right through the room, turn around every 10 seconds and press E twice a second"""
+        if frame % 600 == 1:
+            walking, stopped = (pg.K_d, pg.K_a) if frame // 600 % 2 == 0 else (pg.K_a, pg.K_d)
+            pg.event.post(pg.event.Event(pg.KEYUP, key=stopped))
+            pg.event.post(pg.event.Event(pg.KEYDOWN, key=walking))
+        if frame % 30 == 15:
+            pg.event.post(pg.event.Event(pg.KEYDOWN, key=pg.K_e))
+
+    def result(self):
+        """part -> (mean ms, worst ms)"""
+        return {part: (total * 1000 / self.counted, self.worst[part] * 1000) for part, total in self.totals.items()}
+
+    def report(self):
+        result = self.result()
+        frame_ms = sum(mean for mean, worst in result.values())
+        for part, (mean, worst) in result.items():
+            print(f"[bench] {part:<16}{mean:8.3f} ms{worst:9.3f} ms worst{mean * 100 / frame_ms:6.1f}%")
+        print(f"[bench] {'frame':<16}{frame_ms:8.3f} ms over {self.counted} frames")
+        # one line for bench_stress.py to parse
+        print("[bench] " + json.dumps({"frames": self.counted, "parts": result}))
+
+def parse_flag(argv, flag, bare_value, convert=int):
+    """--flag gives bare_value, --flag=N gives convert(N), missing gives 0"""
+    for arg in argv:
+        if arg == flag:
+            return bare_value
+        if arg.startswith(flag + "="):
+            return convert(arg.split("=", 1)[1])
+    return 0
+
+frame_timer = FrameTimer(parse_flag(sys.argv, "--bench", 1200))
+
+# --- TaskScheduler class ---
+
+FRAME_BUDGET = 1000 / 60 # ms
+TASK_MARGIN = 2 # ms of the budget left for flip and clock.tick overshooting
+
+class Task:
+    def __init__(self, steps, priority, name):
+        self.steps = steps
+        self.priority = priority
+        self.name = name
+        self.waited = 0 # frames since the last step
+        self.done = False
+        self.result = None # what the generator returned
+
+class TaskScheduler:
+    def __init__(self, aging=30, max_wait=120):
+        """
+        Runs generator tasks step by step (one step = up to the next yield) in whatever is left of the frame.
+        Higher priority goes first, a waiting task gains one priority every aging frames,
+        and one that waited max_wait frames gets a step even when the frame has no time left.
+        """
+        self.tasks = []
+        self.aging = aging
+        self.max_wait = max_wait
+
+    def add(self, steps, priority=0, name="task"):
+        task = Task(steps, priority, name)
+        self.tasks.append(task)
+        return task
+
+    def _step(self, task):
+        try:
+            next(task.steps)
+        except StopIteration as stop:
+            task.done = True
+            task.result = stop.value
+            self.tasks.remove(task)
+        task.waited = 0
+
+    def finish(self, task):
+        """Run the rest of task right now (its result is needed this frame), returns its result"""
+        while not task.done:
+            self._step(task)
+        return task.result
+
+    def run(self, budget):
+        """Call once per frame with the ms left in it"""
+        start = time.perf_counter()
+        ran = set()
+        for task in [t for t in self.tasks if t.waited >= self.max_wait]:
+            self._step(task)
+            ran.add(task)
+        while self.tasks and (time.perf_counter() - start) * 1000 < budget:
+            task = max(self.tasks, key=lambda t: t.priority + t.waited / self.aging)
+            self._step(task)
+            ran.add(task)
+        for task in self.tasks:
+            if task not in ran:
+                task.waited += 1
+
+task_scheduler = TaskScheduler()
+
+# --- JobSystem class ---
+
+class JobSystem:
+    def __init__(self, workers=4):
+        """
+        Thread pool for blocking I/O and numpy work. submit() returns a Future, when the job is done
+        on_done(future) runs on the main thread inside drain() (once per frame). Jobs never touch Surfaces, their callbacks do.
+        """
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self.completed = queue.SimpleQueue()
+
+    def submit(self, job, *args, on_done=None):
+        future = self.pool.submit(job, *args)
+        future.add_done_callback(lambda future: self.completed.put((future, on_done)))
+        return future
+
+    def drain(self):
+        """Deliver every finished job, call once per frame from the game loop"""
+        while True:
+            try:
+                future, on_done = self.completed.get_nowait()
+            except queue.Empty:
+                return
+            if on_done is not None:
+                on_done(future)
+
+    def close(self):
+        """Drop jobs that haven't started, don't wait for running ones (e.g. a request to a dead server)"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+job_system = JobSystem()
+
+# --- SurfacePool class ---
+
+class SurfacePool:
+    def __init__(self, max_free=4):
+        """
+        Reuses big surfaces (room layers, overlays) instead of allocating new ones every frame.
+        max_free: how many released surfaces of one (size, flags) are kept around
+        """
+        self.max_free = max_free
+        self.free = {} # (size, flags) -> [surfaces]
+        self.pinned = weakref.WeakSet() # surfaces that are reused by their owner, never recycled
+
+    def pin(self, *surfaces):
+        """Keep surfaces out of the pool even when they're released (e.g. layers that are built once)"""
+        for surface in surfaces:
+            self.pinned.add(surface)
+
+    def acquire(self, size, flags=0, tag="pool", clear=True):
+        """Cleared surface of size/flags, new ones are counted by memory_tracker under tag"""
+        key = (tuple(size), flags)
+        free = self.free.get(key)
+        if free:
+            surface = free.pop()
+            if clear:
+                surface.fill((0, 0, 0, 0))
+            return surface
+        return memory_tracker.track(pg.Surface(key[0], flags), tag)
+
+    def release(self, *surfaces):
+        """Give surfaces back once nothing draws them anymore"""
+        for surface in surfaces:
+            if surface is None:
+                continue
+            key = (surface.get_size(), surface.get_flags() & pg.SRCALPHA)
+            free = self.free.setdefault(key, [])
+            if surface in self.pinned:
+                continue
+            if len(free) < self.max_free and not any(s is surface for s in free):
+                free.append(surface)
+
+surface_pool = SurfacePool()
+
+# --- DrawList class ---
+
+LAYER_FURNITURE = 1 # above furniture_surface, under items_surface
+LAYER_ITEMS = 2     # above items_surface
+
+class DrawList:
+    def __init__(self):
+        """Per-frame blit commands from the game logic, submitted one fblits call per layer"""
+        self.layers = {} # layer -> [(surface, world pos)]
+
+    def add(self, surface, pos, layer):
+        self.layers.setdefault(layer, []).append((surface, pos))
+
+    def clear(self):
+        self.layers.clear()
+
+    def draw(self, target, offset=(0, 0), max_layer=None):
+        """Submit and forget all queued layers up to max_layer (all by default), lowest layer first. offset is in world units"""
+        ox, oy = offset
+        target_w, target_h = target.get_size()
+        for layer in sorted(l for l in self.layers if max_layer is None or l <= max_layer):
+            blits = []
+            for surface, (x, y) in self.layers.pop(layer):
+                # world -> canvas pixels
+                x = (x + ox) // RENDER_SCALE
+                y = (y + oy) // RENDER_SCALE
+                # culling: skip whatever is completely off the target
+                if x < target_w and y < target_h and x + surface.get_width() > 0 and y + surface.get_height() > 0:
+                    blits.append((surface, (x, y)))
+            target.fblits(blits)
+
+draw_list = DrawList()
+
+# --- Text layout engine ---
+
+_fonts = {}
+_word_widths = weakref.WeakKeyDictionary() # font -> {word: width}
+
+def get_font(name, size, sys_font=True):
+    """Cached font lookup, so callers that run every frame don't reload the font file"""
+    key = (name, size, sys_font)
+    if key not in _fonts:
+        _fonts[key] = pg.font.SysFont(name, size) if sys_font else pg.font.Font(name, size)
+    return _fonts[key]
+
+class TextLayout:
+    def __init__(self, font, lines, width, height):
+        """lines: list of (text, x, y) relative to the top left of the layout"""
+        self.font = font
+        self.lines = lines
+        self.width = width
+        self.height = height
+
+    def render(self, color):
+        """Render the whole layout into one transparent surface"""
+        surf = memory_tracker.track(pg.Surface((max(1, self.width), max(1, self.height)), pg.SRCALPHA), "notes")
+        self.draw(surf, (0, 0), color)
+        return surf
+
+    def render_steps(self, color, lines_per_step=4):
+        """render() as a TaskScheduler task, lines_per_step lines per step, returns the surface"""
+        surf = memory_tracker.track(pg.Surface((max(1, self.width), max(1, self.height)), pg.SRCALPHA), "notes")
+        for i in range(0, len(self.lines), lines_per_step):
+            for text, x, y in self.lines[i:i + lines_per_step]:
+                surf.blit(self.font.render(text, True, color), (x, y))
+            yield
+        return surf
+
+    def draw(self, surface, pos, color):
+        """Draw the layout straight onto surface, through the glyph atlas if it's enabled"""
+        if use_glyph_atlas:
+            get_glyph_atlas(self.font, color).draw_lines(surface, self.lines, pos)
+            return
+        for text, x, y in self.lines:
+            surface.blit(self.font.render(text, True, color), (pos[0] + x, pos[1] + y))
+
+def layout_text(text, font, max_width, line_height=36, tab_width=40):
+    """
+    Word-wrap text in linear time: every word is measured once (cached per font)
+    and widths are summed with the font's space advance instead of re-measuring the growing line.
+    Leading tabs indent by tab_width, every \n starts a new line, empty lines keep their height.
+    """
+    widths = _word_widths.get(font)
+    if widths is None:
+        widths = _word_widths[font] = {}
+    space = widths.get(" ")
+    if space is None:
+        space = widths[" "] = font.size(" ")[0]
+
+    lines = []
+    y = 0
+    for line in text.split("\n"):
+        # handle tabulation
+        stripped = line.lstrip("\t")
+        indent = (len(line) - len(stripped)) * tab_width
+
+        cur_words = []
+        cur_width = 0
+        for word in stripped.split():
+            word_width = widths.get(word)
+            if word_width is None:
+                word_width = widths[word] = font.size(word)[0]
+
+            if cur_words and indent + cur_width + space + word_width > max_width:
+                lines.append((" ".join(cur_words), indent, y))
+                y += line_height
+                cur_words = []
+                cur_width = 0
+
+            cur_width += word_width if not cur_words else space + word_width
+            cur_words.append(word)
+
+        if cur_words:
+            lines.append((" ".join(cur_words), indent, y))
+            y += line_height
+        else:
+            # empty line (multiple \n), add spacing
+            y += line_height
+
+    return TextLayout(font, lines, max_width, y)
+
+# --- GlyphAtlas class ---
+
+# optional: python thegame.py --glyph-atlas
+use_glyph_atlas = "--glyph-atlas" in sys.argv
+_glyph_atlases = {}
+
+class GlyphAtlas:
+    def __init__(self, font, color, chars=None, atlas_width=1024):
+        """
+        Every glyph of font/color is rendered once into one atlas surface,
+        strings are then drawn by blitting glyph subsurfaces in a single fblits call.
+        chars: glyphs to bake up front (printable ASCII by default), others are added on first use
+        """
+        self.font = font
+        self.color = color
+        self.atlas_width = atlas_width
+        self.chars = set(chars if chars is not None else (chr(c) for c in range(32, 127)))
+        self._build()
+
+    def _build(self):
+        glyphs = {ch: self.font.render(ch, True, self.color) for ch in sorted(self.chars)}
+        height = max(glyph.get_height() for glyph in glyphs.values())
+
+        # pack glyphs left to right into rows
+        positions = {}
+        x = y = 0
+        for ch, glyph in glyphs.items():
+            if x + glyph.get_width() > self.atlas_width:
+                x = 0
+                y += height
+            positions[ch] = (x, y)
+            x += glyph.get_width()
+
+        self.surface = memory_tracker.track(pg.Surface((self.atlas_width, y + height), pg.SRCALPHA), "notes")
+        self.glyphs = {}
+        for ch, glyph in glyphs.items():
+            gx, gy = positions[ch]
+            # atlas is empty, MAX copies the glyph without darkening its antialiased edges
+            self.surface.blit(glyph, (gx, gy), special_flags=pg.BLEND_RGBA_MAX)
+            self.glyphs[ch] = self.surface.subsurface((gx, gy, glyph.get_width(), glyph.get_height()))
+
+    def _ensure(self, text):
+        missing = set(text) - self.chars
+        if missing:
+            self.chars |= missing
+            self._build()
+
+    def size(self, text):
+        self._ensure(text)
+        return sum(self.glyphs[ch].get_width() for ch in text), self.font.get_height()
+
+    def _queue(self, blits, text, x, y):
+        glyphs = self.glyphs
+        for ch in text:
+            glyph = glyphs[ch]
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+
+    def draw(self, surface, text, pos):
+        self._ensure(text)
+        blits = []
+        self._queue(blits, text, pos[0], pos[1])
+        surface.fblits(blits)
+
+    def draw_lines(self, surface, lines, pos):
+        """lines: (text, x, y) tuples like TextLayout.lines, all submitted in one fblits call"""
+        self._ensure("".join(text for text, x, y in lines))
+        blits = []
+        for text, x, y in lines:
+            self._queue(blits, text, pos[0] + x, pos[1] + y)
+        surface.fblits(blits)
+
+def get_glyph_atlas(font, color):
+    key = (font, tuple(color))
+    if key not in _glyph_atlases:
+        _glyph_atlases[key] = GlyphAtlas(font, color)
+    return _glyph_atlases[key]
+
+def draw_text(surface, text, font, color, **rect_kwargs):
+    """Blit one line of text positioned like Surface.get_rect(**rect_kwargs), returns its rect"""
+    if use_glyph_atlas:
+        atlas = get_glyph_atlas(font, color)
+        rect = pg.Rect((0, 0), atlas.size(text))
+        for attr, value in rect_kwargs.items():
+            setattr(rect, attr, value)
+        atlas.draw(surface, text, rect.topleft)
+        return rect
+
+    text_surf = font.render(text, True, color)
+    rect = text_surf.get_rect(**rect_kwargs)
+    surface.blit(text_surf, rect)
+    return rect
 
 class Note:
     def __init__(self, screen, text, font=None, title="Note", color=(20, 20, 20), panel_color=(245, 245, 220)):
@@ -10,8 +522,8 @@ class Note:
         self.is_open = False
 
         # Fonts
-        self.title_font = pg.font.SysFont("Arial", 40)
-        self.body_font = font if font else pg.font.SysFont("Arial", 28)
+        self.title_font = get_font("Arial", 40)
+        self.body_font = font if font else get_font("Arial", 28)
         self.color = color
         self.panel_color = panel_color
 
@@ -23,43 +535,16 @@ class Note:
         self.padding = 24
         self.tab_width = 40  # pixels per tab
 
-        # Pre-render wrapped text
-        self.text_surfaces = self._wrap_text(self.text, self.body_font, self.panel_width - 2*self.padding)
-
-    def _wrap_text(self, text, font, max_width):
-        """Return list of (surface, rect) tuples for wrapped text, handling tabs and multiple line breaks"""
-        surfaces = []
-        y_offset = 0
-        lines = text.split("\n")  # preserves multiple line breaks
-        for line in lines:
-            # handle tabulation
-            indent = 0
-            while line.startswith("\t"):
-                indent += self.tab_width
-                line = line[1:]  # remove leading tab
-
-            words = line.split()
-            cur_line = ""
-            for word in words:
-                test_line = f"{cur_line} {word}".strip()
-                if font.size(test_line)[0] + indent <= max_width:
-                    cur_line = test_line
-                else:
-                    surf = font.render(cur_line, True, self.color)
-                    rect = surf.get_rect(topleft=(self.panel_x + self.padding + indent, self.panel_y + 80 + y_offset))
-                    surfaces.append((surf, rect))
-                    y_offset += 36
-                    cur_line = word
-            if cur_line:
-                surf = font.render(cur_line, True, self.color)
-                rect = surf.get_rect(topleft=(self.panel_x + self.padding + indent, self.panel_y + 80 + y_offset))
-                surfaces.append((surf, rect))
-                y_offset += 36
-
-            # if line was empty (multiple \n), add spacing
-            if not line.strip():
-                y_offset += 36
-        return surfaces
+        # Wrapped and pre-rendered in the spare time of the first frames, draw() finishes it if it's opened before
+        self.layout = None
+        self.text_surface = None
+        self.preparing = task_scheduler.add(self._prepare(), name="note")
+
+    def _prepare(self):
+        self.layout = layout_text(self.text, self.body_font, self.panel_width - 2*self.padding, tab_width=self.tab_width)
+        yield
+        if not use_glyph_atlas:
+            self.text_surface = yield from self.layout.render_steps(self.color)
 
     def check_opened(self):
         return self.is_open
@@ -79,9 +564,10 @@ class Note:
             return
 
         # Semi-transparent overlay
-        overlay = pg.Surface(self.screen.get_size(), pg.SRCALPHA)
+        overlay = surface_pool.acquire(self.screen.get_size(), pg.SRCALPHA, "overlays", clear=False)
         overlay.fill((0, 0, 0, 160))
         self.screen.blit(overlay, (0, 0))
+        surface_pool.release(overlay)
 
         # Panel
         panel_rect = pg.Rect(self.panel_x, self.panel_y, self.panel_width, self.panel_height)
@@ -89,28 +575,29 @@ class Note:
         pg.draw.rect(self.screen, (50, 50, 50), panel_rect, width=4, border_radius=16)  # border
 
         # Title
-        title_surf = self.title_font.render(self.title, True, (50, 50, 50))
-        title_rect = title_surf.get_rect(midtop=(self.screen.get_width()//2, self.panel_y + 20))
-        self.screen.blit(title_surf, title_rect)
+        draw_text(self.screen, self.title, self.title_font, (50, 50, 50), midtop=(self.screen.get_width()//2, self.panel_y + 20))
 
         # Body text
-        for surf, rect in self.text_surfaces:
-            self.screen.blit(surf, rect)
+        if not self.preparing.done:
+            task_scheduler.finish(self.preparing)
+        body_pos = (self.panel_x + self.padding, self.panel_y + 80)
+        if self.text_surface is None:
+            self.layout.draw(self.screen, body_pos, self.color)
+        else:
+            self.screen.blit(self.text_surface, body_pos)
 
         # Hint
-        hint_font = pg.font.SysFont("Arial", 22)
-        hint_surf = hint_font.render("Press E to close", True, (80, 80, 80))
-        hint_rect = hint_surf.get_rect(midbottom=(self.screen.get_width()//2, self.panel_y + self.panel_height - 20))
-        self.screen.blit(hint_surf, hint_rect)
+        draw_text(self.screen, "Press E to close", get_font("Arial", 22), (80, 80, 80), midbottom=(self.screen.get_width()//2, self.panel_y + self.panel_height - 20))
 
 # --- SpriteAnimator class ---
 
 class SpriteAnimator:
-    def __init__(self, sprite_sheet_path, rows, cols, scale=1, frame_delay=200, offset_x=0, offset_y=0):
+    def __init__(self, sprite_sheet_path, rows, cols, scale=1, frame_delay=200, offset_x=0, offset_y=0, align_to=None):
         """
         offset_x, offset_y: manually shift the sprite when drawing to align different animations
+        align_to: another SpriteAnimator, computes offset_x/offset_y so both first frames share their feet (bottom center)
         """
-        self.sprite_sheet = pg.image.load(sprite_sheet_path).convert_alpha()
+        self.sprite_sheet_path = sprite_sheet_path
         self.rows = rows
         self.cols = cols
         self.scale = scale
@@ -118,44 +605,117 @@ class SpriteAnimator:
         self.offset_x = offset_x
         self.offset_y = offset_y
 
-        self.frames = self._load_frames()
-        self.current_frame = 0
-        self.timer = 0
-
-        # --- Option 1: use first frame as reference for hitbox size ---
-        self.base_rect = self.frames[0].get_rect()
+        baked = baked_asset(sprite_sheet_path, scale, (rows, cols))
+        if baked:
+            # already trimmed and scaled by bake_assets.py
+            self.frames = [asset_pack.load(f) for f in baked["files"]]
+            self.frame_sizes = [tuple(size) for size in baked["world_sizes"]]
+        else:
+            self.sprite_sheet = pg.image.load(sprite_sheet_path).convert_alpha()
+            self.frames = self._load_frames()
+        hot_reloader.watch_animator(self)
+        self.system = None # AnimationSystem that owns current_frame/timer, see AnimationSystem.add
+        self.index = -1
+        self._current_frame = 0
+        self._timer = 0
+
+        # --- Option 1: use first frame as reference for hitbox size (in world units) ---
+        self.base_rect = pg.Rect((0, 0), self.frame_sizes[0])
+
+        if align_to is not None:
+            self.offset_x = align_to.offset_x + (align_to.base_rect.width - self.base_rect.width) / 2
+            self.offset_y = align_to.offset_y + align_to.base_rect.height - self.base_rect.height
 
     def draw(self, surface, x, y, flip_x=False):
         """Draw current frame, optionally flipped horizontally"""
         frame = self.get_frame()
         if flip_x:
             frame = pg.transform.flip(frame, True, False)
-        surface.blit(frame, (x + self.offset_x, y + self.offset_y))
+        surface.blit(frame, ((x + self.offset_x) / RENDER_SCALE, (y + self.offset_y) / RENDER_SCALE))
+
+    def _trim_rects(self, frame_width, frame_height):
+        """
+        (bounding rect of every frame inside its cell, world size of every frame). get_bounding_rect scans every pixel,
+        so both are cached next to the sheet (<sheet>.frames.json) keyed by the sheet's hash and rows/cols/scale.
+        The world sizes are what base_rect (hitbox) and align_to offsets are computed from.
+        """
+        cache_path = self.sprite_sheet_path + ".frames.json"
+        with open(self.sprite_sheet_path, "rb") as f:
+            key = f"{hashlib.sha1(f.read()).hexdigest()}:{self.rows}x{self.cols}@{self.scale:g}"
+
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cache = {}
+        if key in cache:
+            return [pg.Rect(r) for r in cache[key]["rects"]], [tuple(size) for size in cache[key]["world_sizes"]]
+
+        rects = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                frame = self.sprite_sheet.subsurface((col * frame_width, row * frame_height, frame_width, frame_height))
+                rects.append(frame.get_bounding_rect())  # trim transparent edges
+
+        world_sizes = [(int(r.width*self.scale), int(r.height*self.scale)) for r in rects]
+        # a sheet only ever needs its current entry
+        cache = {key: {"rects": [tuple(r) for r in rects], "world_sizes": world_sizes}}
+        try:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+        except OSError:
+            pass # read-only install, just scan again next time
+        return rects, world_sizes
+
+    def reload(self):
+        """Cut the frames out of the sheet on disk again (hot reload), the rows/cols stay the same"""
+        self.sprite_sheet = pg.image.load(self.sprite_sheet_path).convert_alpha()
+        self.frames = self._load_frames()
+        self.base_rect = pg.Rect((0, 0), self.frame_sizes[0])
 
     def _load_frames(self):
         frames = []
         frame_width = self.sprite_sheet.get_width() // self.cols
         frame_height = self.sprite_sheet.get_height() // self.rows
+        trim_rects, self.frame_sizes = self._trim_rects(frame_width, frame_height) # frame_sizes: world size of every frame
 
         for row in range(self.rows):
             for col in range(self.cols):
-                x = col * frame_width
-                y = row * frame_height
-                frame = self.sprite_sheet.subsurface((x, y, frame_width, frame_height))
-                rect = frame.get_bounding_rect()  # trim transparent edges
-                frame = frame.subsurface(rect).copy()
+                rect = trim_rects[row * self.cols + col].move(col * frame_width, row * frame_height)
                 frame = pg.transform.scale(
-                    frame, (int(frame.get_width()*self.scale), int(frame.get_height()*self.scale))
+                    self.sprite_sheet.subsurface(rect), (int(rect.width*self.scale/RENDER_SCALE), int(rect.height*self.scale/RENDER_SCALE))
                 )
                 frames.append(frame)
         return frames
 
+    @property
+    def current_frame(self):
+        if self.system is not None:
+            return int(self.system.current[self.index])
+        return self._current_frame
+
+    @current_frame.setter
+    def current_frame(self, value):
+        if self.system is not None:
+            self.system.current[self.index] = value
+        else:
+            self._current_frame = value
+
+    @property
+    def timer(self):
+        if self.system is not None:
+            return float(self.system.timer[self.index])
+        return self._timer
+
     def update(self, dt):
-        """Call every frame with dt = clock.tick()"""
-        self.timer += dt
-        if self.timer >= self.frame_delay:
-            self.timer = 0
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
+        """Call every frame with dt = clock.tick(), not needed when an AnimationSystem owns the animator"""
+        if self.system is not None:
+            return
+        self._timer += dt
+        if self._timer >= self.frame_delay:
+            # keep the remainder so the animation speed doesn't depend on the frame rate
+            steps, self._timer = divmod(self._timer, self.frame_delay)
+            self._current_frame = (self._current_frame + int(steps)) % len(self.frames)
 
     def get_frame(self):
         """Returns current frame surface to draw"""
@@ -171,63 +731,578 @@ class SpriteAnimator:
         rect.midbottom = (x + rect.width // 2, y + self.base_rect.height)
         return rect.inflate(-rect.width * shrink, -rect.height * shrink)
 
-# Portal logic
-def portal_logic(save_player=True, data_from_request="SOME_SECRET_DATA_FROM_POST"):
-    font = pg.font.SysFont(None, 28)
+# --- AnimationSystem class ---
 
-    # --- read + normalize ---
-    try:
-        content = open("./answer.txt", "r", encoding="utf-8").read().strip()
-    except FileNotFoundError:
-        content = ""
+class AnimationSystem:
+    def __init__(self, capacity=16):
+        """
+        Owns the frame/timer state of many SpriteAnimators in flat numpy arrays
+        and advances all of them with one vectorised step per tick.
+        """
+        self.animators = []
+        self.current = np.zeros(capacity, np.int32)
+        self.timer = np.zeros(capacity, np.float64)
+        self.delay = np.ones(capacity, np.float64)
+        self.frame_count = np.ones(capacity, np.int32)
+        self.visible = np.zeros(capacity, bool)
+        self.room = np.full(capacity, -1, np.int32) # -1 = every room
+        self.room_ids = {}
+
+    def _room_id(self, room):
+        return self.room_ids.setdefault(room, len(self.room_ids))
+
+    def add(self, animator, room=None, visible=True):
+        """room: (current_level, current_direction) the animator lives in, None for everywhere (e.g. the player)"""
+        i = len(self.animators)
+        if i == len(self.current):
+            size = 2 * i
+            for name in ("current", "timer", "delay", "frame_count", "visible", "room"):
+                old = getattr(self, name)
+                new = np.full(size, -1 if name == "room" else 0, old.dtype)
+                new[:i] = old
+                setattr(self, name, new)
+
+        self.animators.append(animator)
+        self.current[i] = animator.current_frame
+        self.timer[i] = animator.timer
+        self.delay[i] = animator.frame_delay
+        self.frame_count[i] = len(animator.frames)
+        self.visible[i] = visible
+        self.room[i] = -1 if room is None else self._room_id(room)
+        animator.system = self
+        animator.index = i
+        return animator
+
+    def set_visible(self, animator, visible):
+        self.visible[animator.index] = visible
+
+    def update(self, dt, room=None):
+        """Advance every visible animator (in room, if given) by dt ms, keeping the remainder of the timers"""
+        n = len(self.animators)
+        active = self.visible[:n].copy()
+        if room is not None:
+            room_id = self.room_ids.get(room, -2)
+            active &= (self.room[:n] == -1) | (self.room[:n] == room_id)
+
+        timer = self.timer[:n]
+        timer[active] += dt
+        steps = (timer // self.delay[:n]).astype(np.int32)
+        timer -= steps * self.delay[:n]
+        self.current[:n] = (self.current[:n] + steps) % self.frame_count[:n]
+
+# --- MonsterSystem class ---
+
+MONSTER_WANDER = 0
+MONSTER_CHASE = 1
+MONSTER_MAX_DT = 250 # ms
+
+class MonsterGroup:
+    def __init__(self, pos, size, rng):
+        """The monsters of one room, one row per monster (positions are the top left of the hitbox in level coordinates)"""
+        count = len(pos)
+        self.pos = pos.astype(np.float32)
+        self.vel = np.zeros((count, 2), np.float32)
+        self.size = np.tile(np.asarray(size, np.float32), (count, 1))
+        self.state = np.full(count, MONSTER_WANDER, np.int8)
+        self.turn = rng.uniform(0, 2000, count) # ms until a wandering monster picks a new direction
+        self.phase = rng.integers(0, 1000, count) # so they don't all step in sync
+
+class MonsterSystem:
+    def __init__(self, frames, spawns, default_count=0, speed=120, chase_speed=200, sight=900, seed=0):
+        """
+        Monsters of every room simulated with numpy, one vectorised step per tick for all monsters of the room.
+        frames: animation frames facing right (canvas scale)
+        spawns: level -> (count, spawn area in level coordinates), other levels get default_count anywhere
+        They follow the room's NavGrid flow field to the player once the player is within sight (path length in px).
+        """
+        self.set_frames(frames)
+        self.size = (max(world_width(f) for f in frames), max(world_height(f) for f in frames))
+        self.spawns = spawns
+        self.default_count = default_count
+        self.speed = speed
+        self.chase_speed = chase_speed
+        self.sight = sight
+        self.rng = np.random.default_rng(seed)
+        self.groups = {} # room -> MonsterGroup
+
+    def set_frames(self, frames):
+        """Swap in new frames (hot reload), the monsters keep the size they were made with"""
+        self.frames = frames + [pg.transform.flip(frame, True, False) for frame in frames]
+        self.frame_count = len(frames)
+
+    def _spawn(self, room, nav, player):
+        count, area = self.spawns.get(room[0], (self.default_count, None))
+        area = pg.Rect(0, 0, nav.width, 1080).clip(area or (0, 0, nav.width, 1080))
+        size = np.asarray(self.size, np.float32)
+        pos = np.empty((0, 2), np.float32)
+        # keep picking random spots until enough of them are free and away from the player
+        for attempt in range(20):
+            if len(pos) >= count:
+                break
+            tries = (count - len(pos)) * 4
+            candidates = np.stack([
+                self.rng.uniform(area.left, max(area.left, area.right - size[0]), tries),
+                self.rng.uniform(area.top, max(area.top, area.bottom - size[1]), tries)
+            ], axis=1).astype(np.float32)
+            free = nav.fits(candidates, size)
+            free &= np.hypot(*(candidates + size / 2 - player.center).T) > 400
+            pos = np.concatenate([pos, candidates[free]])
+        return MonsterGroup(pos[:count], self.size, self.rng)
+
+    def update(self, dt, room, nav, player):
+        """
+        Move the monsters of room by dt ms. nav: the room's NavGrid, player: player hitbox in level coordinates.
+        Returns True if a monster touches the player.
+        A hitch (loading, F9) counts as at most MONSTER_MAX_DT, and a step never moves a monster further than
+        one nav.mask cell, longer frames are split up, so nothing tunnels through a thin wall.
+        """
+        group = self.groups.get(room)
+        if group is None:
+            group = self.groups[room] = self._spawn(room, nav, player)
+        if not len(group.pos):
+            return False
+        dt = min(dt, MONSTER_MAX_DT)
+        step_dt = nav.cell / max(self.speed, self.chase_speed) * 1000
+        if dt > step_dt:
+            steps = int(np.ceil(dt / step_dt))
+            caught = False
+            for _ in range(steps):
+                caught |= self.update(dt / steps, room, nav, player)
+            return caught
+
+        # the flow field leads a monster's top left to where its hitbox would be centered on the player
+        target = np.asarray(player.center, np.float32) - np.asarray(self.size, np.float32) / 2
+        nav.set_target(target, self.sight)
+        direction, steps = nav.sample(group.pos)
+        group.state = np.where(steps >= 0, MONSTER_CHASE, MONSTER_WANDER).astype(np.int8)
+        chasing = group.state == MONSTER_CHASE
+        group.vel[chasing] = direction[chasing] * self.chase_speed
+
+        # last cell or two: straight at the player
+        close = chasing & (steps <= 1)
+        to_player = target - group.pos[close]
+        distance = np.maximum(np.hypot(to_player[:, 0], to_player[:, 1]), 1)
+        group.vel[close] = to_player / distance[:, None] * self.chase_speed
+
+        group.turn -= dt
+        turning = (group.turn <= 0) & ~chasing
+        angle = self.rng.uniform(0, 2 * np.pi, turning.sum())
+        group.vel[turning] = np.stack([np.cos(angle), np.sin(angle)], axis=1) * self.speed
+        group.turn[turning] = self.rng.uniform(1000, 3000, len(angle))
+
+        # one axis at a time so they slide along walls, wanderers bounce off
+        for axis in (0, 1):
+            moved = group.pos.copy()
+            moved[:, axis] += group.vel[:, axis] * (dt / 1000)
+            leading = (group.vel[:, axis, None] > 0).astype(np.float32) # right/bottom edge when moving that way
+            across = nav.edge[None, :]
+            blocked = nav.blocked(moved, group.size, *((leading, across) if axis == 0 else (across, leading)))
+            group.pos[~blocked] = moved[~blocked]
+            group.vel[blocked & ~chasing, axis] *= -1
+
+        touching = ((group.pos[:, 0] < player.right) & (group.pos[:, 0] + group.size[:, 0] > player.left) &
+                    (group.pos[:, 1] < player.bottom) & (group.pos[:, 1] + group.size[:, 1] > player.top))
+        return bool(touching.any())
+
+    def draw(self, target, room, offset=(0, 0)):
+        """Blit every monster of room that's on target with one fblits call, offset: level position"""
+        group = self.groups.get(room)
+        if group is None or not len(group.pos):
+            return
+        pos = ((group.pos + offset) // RENDER_SCALE).astype(np.int32)
+        frame_w, frame_h = self.frames[0].get_size()
+        on_target = ((pos[:, 0] > -frame_w) & (pos[:, 1] > -frame_h) &
+                     (pos[:, 0] < target.get_width()) & (pos[:, 1] < target.get_height()))
+        frame = (pg.time.get_ticks() // 200 + group.phase) % self.frame_count
+        frame += (group.vel[:, 0] < 0) * self.frame_count # facing left
+        target.fblits([(self.frames[i], xy) for i, xy in zip(frame[on_target].tolist(), pos[on_target].tolist())])
+
+# --- AnswerWatcher class ---
 
-    normalized = content.lower().replace(" ", "")
-    valid = False
+ANSWER_CHANGED = pg.USEREVENT + 1
 
+def is_answer_valid(normalized):
+    """normalized = lowercased answer without spaces"""
     if normalized == "uldr":   # up-left-down-right
-        valid = True
-    else:
-        seq = re.sub(r'[^a-z]', '', normalized)
-        for word, ch in [("up","u"),("down","d"),("left","l"),("right","r")]:
-            seq = seq.replace(word, ch)
-        if seq == "uldr":
-            valid = True
+        return True
+
+    seq = re.sub(r'[^a-z]', '', normalized)
+    for word, ch in [("up","u"),("down","d"),("left","l"),("right","r")]:
+        seq = seq.replace(word, ch)
+    return seq == "uldr"
+
+class AnswerWatcher:
+    def __init__(self, path="./answer.txt", poll_interval=250):
+        """
+        poll_interval: min ms between two stat() calls, the file is only re-read if its mtime or size changed.
+        stat and read run as JobSystem jobs, loaded turns True once the first read is in.
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self.exists = False
+        self.content = ""
+        self.normalized = ""
+        self.valid = False
+        self.loaded = False
+
+        self._stamp = None
+        self._last_poll = None
+        self._reading = None # Future of the running read
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def poll(self, now=None):
+        """Call every frame, posts ANSWER_CHANGED (from JobSystem.drain) when the file changed"""
+        now = pg.time.get_ticks() if now is None else now
+        if self._reading is not None:
+            return
+        if self._last_poll is not None and now - self._last_poll < self.poll_interval:
+            return
+        first_poll = self._last_poll is None
+        self._last_poll = now
+        self._reading = job_system.submit(self._read, self._stamp, first_poll, on_done=self._read_done)
+
+    def _read(self, stamp, first_poll):
+        """Job thread: (stamp, content or None if there's no file), or None if it didn't change or can't be read right now"""
+        new_stamp = self._stat()
+        if new_stamp == stamp and not first_poll:
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return new_stamp, f.read().strip()
+        except FileNotFoundError:
+            return new_stamp, None
+        except UnicodeDecodeError:
+            print(f"{self.path} isn't utf-8 text, counting it as empty")
+            return new_stamp, ""
+        except OSError:
+            return None # locked or replaced mid-read (editors do that): keep the last answer, the next poll tries again
+
+    def _read_done(self, future):
+        self._reading = None
+        changed = future.result()
+        if changed is None:
+            return
+        self._stamp, content = changed
+        self.exists = content is not None
+        self.content = content or ""
+        self.normalized = self.content.lower().replace(" ", "")
+        self.valid = is_answer_valid(self.normalized)
+        self.loaded = True
+        pg.event.post(pg.event.Event(ANSWER_CHANGED, content=self.content, valid=self.valid))
+
+answer_watcher = AnswerWatcher()
+
+# --- HotReloader class ---
+# python thegame.py --dev: edit a room in build_level/build_furniture/build_items or a sprite png and save,
+# the running game swaps it in without a restart and the player stays where they are.
+
+ROOM_FUNCTIONS = ("build_level", "build_furniture", "build_items")
+
+def room_branches(node, lines):
+    """level -> source of the function's `if current_level == N` branch, None -> everything outside those branches"""
+    branches = {}
+    inside = set()
+    for stmt in ast.walk(node):
+        test = getattr(stmt, "test", None)
+        if (isinstance(stmt, ast.If) and isinstance(test, ast.Compare) and isinstance(test.left, ast.Name)
+                and test.left.id == "current_level" and isinstance(test.ops[0], ast.Eq) and isinstance(test.comparators[0], ast.Constant)):
+            start, end = stmt.body[0].lineno - 1, stmt.body[-1].end_lineno
+            branches[test.comparators[0].value] = "\n".join(lines[start:end])
+            inside.update(range(start, end))
+    branches[None] = "\n".join(line for i, line in enumerate(lines[node.lineno - 1:node.end_lineno], node.lineno - 1) if i not in inside)
+    return branches
+
+class HotReloader:
+    def __init__(self, namespace, source, enabled=False, poll_interval=500):
+        """
+        namespace: globals() of the game, reloaded room functions are defined in there
+        source: file the room functions are in
+        enabled: off = every method does nothing, so the game can call them unconditionally
+        poll_interval: min ms between two stat() rounds, they run as JobSystem jobs like AnswerWatcher
+        """
+        self.namespace = namespace
+        self.source = source
+        self.enabled = enabled
+        self.poll_interval = poll_interval
+        self.functions = ROOM_FUNCTIONS # room functions to reload, the stress rooms turn this off
+        self.sprites = {} # path -> [(surface the game draws, loader that makes a fresh copy)]
+        self.animators = {} # sheet path -> [SpriteAnimator]
+        self.callbacks = {} # path -> [callback()] that rebuild copies made from its sprites
+        self.branches = {} # room function -> room_branches of the source it was last defined from
+
+        self._stamps = {}
+        self._last_poll = None
+        self._checking = None # Future of the running stat round
+        if enabled:
+            self._parse(self._read_source(), define=False)
+
+    def watch(self, path, surface, loader):
+        """surface was loaded from path, loader() loads it again (as a surface of the same size and format)"""
+        if self.enabled:
+            self.sprites.setdefault(path, []).append((surface, loader))
+
+    def watch_animator(self, animator):
+        if self.enabled:
+            self.animators.setdefault(animator.sprite_sheet_path, []).append(animator)
+
+    def after_reload(self, path, callback):
+        """callback() runs after path was reloaded, for copies that aren't the same size (rotated, tinted, ...)"""
+        if self.enabled:
+            self.callbacks.setdefault(path, []).append(callback)
+
+    def derived(self, surface, copy):
+        """copy (e.g. to_indexed) is drawn instead of surface, reloads go into copy from now on"""
+        for entries in self.sprites.values():
+            entries[:] = [(copy if target is surface else target, loader) for target, loader in entries]
+
+    def poll(self, now=None):
+        """Call every frame, changed files are reloaded from JobSystem.drain"""
+        if not self.enabled or self._checking is not None:
+            return
+        now = pg.time.get_ticks() if now is None else now
+        if self._last_poll is not None and now - self._last_poll < self.poll_interval:
+            return
+        self._last_poll = now
+        paths = [self.source, *self.sprites, *self.animators]
+        self._checking = job_system.submit(self._check, paths, dict(self._stamps), on_done=self._check_done)
+
+    def _check(self, paths, stamps):
+        """Job thread: (new stamps, paths that changed since stamps), nothing counts as changed on the first round"""
+        new_stamps = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+                new_stamps[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                new_stamps[path] = None # gone or not readable right now, changed again once it's back
+        changed = [path for path in paths if stamps and new_stamps[path] != stamps.get(path)]
+        return new_stamps, changed
+
+    def _check_done(self, future):
+        self._checking = None
+        self._stamps, changed = future.result()
+        for path in changed:
+            if path == self.source:
+                self._parse(self._read_source())
+            else:
+                self._reload_sprite(path)
+
+    def _read_source(self):
+        with open(self.source, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _parse(self, text, define=True):
+        """Define the room functions whose source changed and forget the rooms they build differently now"""
+        try:
+            tree = ast.parse(text, self.source)
+        except SyntaxError as e:
+            print(f"[dev] {self.source}:{e.lineno}: {e.msg}, keeping the old rooms")
+            return
+        lines = text.splitlines()
+        levels = set()
+        for node in tree.body:
+            if not isinstance(node, ast.FunctionDef) or node.name not in self.functions:
+                continue
+            branches = room_branches(node, lines)
+            old = self.branches.get(node.name, {})
+            if not define:
+                self.branches[node.name] = branches
+                continue
+            if branches == old:
+                continue
+            try:
+                exec(compile(ast.Module([node], []), self.source, "exec"), self.namespace)
+            except Exception as e:
+                print(f"[dev] {node.name}: {e!r}, keeping the old one")
+                continue # branches stay the old ones, so the next save tries again
+            self.branches[node.name] = branches
+            changed = {level for level in branches.keys() | old.keys() if branches.get(level) != old.get(level)}
+            levels = None if levels is None or None in changed else levels | changed
+            print(f"[dev] reloaded {node.name}: " + ("every level" if None in changed else f"level {', '.join(map(str, sorted(changed)))}"))
+        if levels is None or levels:
+            forget_rooms(levels)
+
+    def _reload_sprite(self, path):
+        try:
+            for target, loader in self.sprites.get(path, []):
+                fresh = loader()
+                if fresh.get_size() != target.get_size():
+                    # rooms keep their own rects/positions for it, those only match after a restart
+                    print(f"[dev] {path} is {fresh.get_size()} now instead of {target.get_size()}, restart to see it")
+                    return
+                if target.get_bitsize() == 8:
+                    to_indexed(fresh, into=target)
+                else:
+                    # adding onto a cleared surface copies the pixels alpha and all
+                    target.fill((0, 0, 0, 0))
+                    target.blit(fresh, (0, 0), special_flags=pg.BLEND_RGBA_ADD)
+            for animator in self.animators.get(path, []):
+                animator.reload()
+            for callback in self.callbacks.get(path, []):
+                callback()
+        except (pg.error, OSError, ValueError) as e:
+            print(f"[dev] {path}: {e}, keeping the old one")
+            return
+        print(f"[dev] reloaded {path}")
 
+hot_reloader = HotReloader(globals(), __file__, "--dev" in sys.argv)
+
+# Portal logic
+def portal_logic(save_player=True, data_from_request="SOME_SECRET_DATA_FROM_POST"):
     # --- choose message ---
-    if save_player and valid:
+    if save_player and answer_watcher.valid:
         msg = f"Your answer is correct. Here is your data: {data_from_request}"
     else:
         msg = "Please press ESC to leave the game, and create an answer.txt where the content should be"
+    return portal_message(msg)
+
+def portal_message(msg):
+    font = get_font(None, 28)
 
     # --- wrap text into lines ---
-    wrapped = textwrap.wrap(msg, width=60)
+    width = 1000
+    layout = layout_text(msg, font, width - 40, line_height=30)
 
     # --- render to surface ---
-    width, height = 1000, 80 + 25 * len(wrapped)
-    surf = pg.Surface((width, height))
+    height = 80 + 25 * len(layout.lines)
+    surf = memory_tracker.track(pg.Surface((width, height)), "overlays")
     surf.fill((30, 30, 30))
-
-    for i, line in enumerate(wrapped):
-        text_surface = font.render(line, True, (255, 255, 255))
-        surf.blit(text_surface, (20, 20 + i * 30))
+    surf.blit(layout.render((255, 255, 255)), (20, 20))
 
     return surf
 
-def get_data_from_server():
-    try:
-        req_text = open("./answer.txt", "r", encoding="utf-8").read().strip()
-    except FileNotFoundError:
-        req_text = "File answer.txt not found."
+def answer_request_text():
+    if answer_watcher.exists:
+        return answer_watcher.content
+    return "File answer.txt not found."
 
-    r = requests.post("http://127.0.0.1:8000", data={"answer": req_text})
+def get_data_from_server(req_text):
+    """Blocks until the server answers, run it as a JobSystem job"""
+    r = requests.post("http://127.0.0.1:8000", data={"answer": req_text}, timeout=10)
     return r.text
 
+def portal_data_received(future, answer):
+    """JobSystem callback of get_data_from_server, answer: (content, valid) the request was made for"""
+    global portal_surf, portal_request
+    portal_request = None
+    if answer != (answer_watcher.content, answer_watcher.valid):
+        return # answer.txt changed while waiting, the portal asks again
+    try:
+        req_text = future.result()
+    except requests.RequestException as err:
+        req_text = f"(server not reachable: {err.__class__.__name__})"
+    portal_surf = portal_logic(True, req_text)
+
 # --- Initialize Pygame ---
+if memory_tracker.soak_seconds or frame_timer.frames:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # soak test and benchmark run headless
 pg.init()
 screen = pg.display.set_mode((1920, 1080), pg.FULLSCREEN)
 pg.display.set_caption("Never thought about how to call this game")
 clock = pg.time.Clock()
 
+# --- Render scale ---
+# World coordinates (walls, furniture, player, mouse) are always 1920x1080 screen pixels.
+# python thegame.py --low-res keeps the art RENDER_SCALE times smaller, composes the world
+# on a canvas that much smaller and upscales it to the screen once per frame.
+RENDER_SCALE = 3 if "--low-res" in sys.argv else 1
+canvas = screen if RENDER_SCALE == 1 else pg.Surface((screen.get_width() // RENDER_SCALE, screen.get_height() // RENDER_SCALE))
+
+def to_canvas(pos):
+    """World position/size -> canvas pixels"""
+    return (pos[0] // RENDER_SCALE, pos[1] // RENDER_SCALE)
+
+def world_width(surface):
+    return surface.get_width() * RENDER_SCALE
+
+def world_height(surface):
+    return surface.get_height() * RENDER_SCALE
+
+# pre-scaled sprites from bake_assets.py, keyed by bake_assets.asset_key
+def load_baked_manifest(path=MANIFEST):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["assets"]
+    except FileNotFoundError:
+        return {}
+
+baked_assets = load_baked_manifest()
+
+def baked_asset(path, scale, sheet=None):
+    """Manifest entry for an image loaded at scale (world units), None if it isn't baked or its source changed since"""
+    key = asset_key(path, scale / RENDER_SCALE, sheet)
+    entry = baked_assets.get(key)
+    if entry and entry["input_hash"] != input_hash(path, scale, RENDER_SCALE, sheet):
+        print(f"{key} changed since it was baked, loading the source (run bake_assets.py)")
+        entry = baked_assets[key] = None
+    return entry
+
+class AssetPack:
+    def __init__(self, path=PACK):
+        """
+        mmap of the raw pixel pack bake_assets.py writes (format described there).
+        Surfaces are created straight from slices of the mapping, so loading a sprite is a few page faults
+        and other game processes share the same pages.
+        """
+        self.entries = {} # baked file name -> (width, height, offset)
+        self.map = None
+        try:
+            with open(path, "rb") as f:
+                # private (copy on write) mapping: pages stay shared unless something draws onto a sprite
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (FileNotFoundError, ValueError):
+            return
+        self.view = memoryview(self.map)
+
+        magic, version, count = PACK_HEADER.unpack_from(self.map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            print(f"Ignoring asset pack {path}: unsupported format {magic!r} v{version}")
+            return
+        offset = PACK_HEADER.size
+        for _ in range(count):
+            (length,) = PACK_NAME_LEN.unpack_from(self.map, offset)
+            offset += PACK_NAME_LEN.size
+            name = bytes(self.map[offset:offset+length]).decode()
+            offset += length
+            self.entries[name] = PACK_ENTRY.unpack_from(self.map, offset)
+            offset += PACK_ENTRY.size
+
+    def load(self, name):
+        """Surface for a baked file, from the pack if it's in there"""
+        entry = self.entries.get(name)
+        if entry is None:
+            return pg.image.load(name).convert_alpha()
+        width, height, offset = entry
+        return pg.image.frombuffer(self.view[offset:offset + width*height*4], (width, height), "BGRA")
+
+asset_pack = AssetPack()
+
+def load_sprite(path, scale=1, alpha=True):
+    """Load an image at scale times its pixel size in world units, i.e. scale / RENDER_SCALE on the canvas"""
+    baked = baked_asset(path, scale)
+    if baked:
+        image = asset_pack.load(baked["files"][0])
+        image = image if alpha else image.convert()
+    else:
+        image = load_sprite_file(path, scale, alpha)
+    hot_reloader.watch(path, image, lambda: load_sprite_file(path, scale, alpha))
+    return image
+
+def load_sprite_file(path, scale=1, alpha=True):
+    """load_sprite straight from the png, without the baked assets"""
+    image = pg.image.load(path)
+    image = image.convert_alpha() if alpha else image.convert()
+    if scale != RENDER_SCALE:
+        size = (round(image.get_width() * scale / RENDER_SCALE), round(image.get_height() * scale / RENDER_SCALE))
+        image = pg.transform.scale(image, size)
+    return image
+
 # --- Usage Tutorial ---
 # Creating animations for the player:
 #   player_anim = SpriteAnimator("sprites/player_idle.png", rows=3, cols=2, scale=5, frame_delay=300)
@@ -235,6 +1310,10 @@ clock = pg.time.Clock()
 # Updating the animation each frame:
 #   player_anim.update(dt)
 #
+# Or let one AnimationSystem update all animators at once (only visible ones advance):
+#   animation_system.add(player_anim)
+#   animation_system.update(dt, (current_level, current_direction))
+#
 # Drawing the current frame:
 #   player_anim.draw(screen, player_x, player_y)
 #
@@ -253,12 +1332,41 @@ clock = pg.time.Clock()
 
 # --- Create player animator ---
 player_anim = SpriteAnimator("sprites/player_idle.png", rows=3, cols=2, scale=5, frame_delay=400)
-player_walk_anim = SpriteAnimator("sprites/player_walk.png", rows=2, cols=2, scale=5, offset_x=17.5, frame_delay=400)
+player_walk_anim = SpriteAnimator("sprites/player_walk.png", rows=2, cols=2, scale=5, frame_delay=400, align_to=player_anim)
+animation_system = AnimationSystem()
+animation_system.add(player_anim)
+animation_system.add(player_walk_anim, visible=False)
+
+# --- Monsters ---
+# "they" come after you in level 4, from the far end of the room you come in to.
+# python thegame.py --monsters=N puts N monsters in every room (e.g. with --stress)
+def monster_frames():
+    """The player's walk frames, tinted red"""
+    frames = []
+    for frame in player_walk_anim.frames:
+        frame = frame.copy()
+        frame.fill((120, 20, 20, 255), special_flags=pg.BLEND_RGBA_MULT)
+        frames.append(frame)
+    return frames
+
+monster_count = parse_flag(sys.argv, "--monsters", 100)
+monster_spawns = {} if monster_count else {4: (8, pg.Rect(1655, 600, 445, 420))} # below the doors, between the two walls
+monster_system = MonsterSystem(monster_frames(), monster_spawns, monster_count)
+hot_reloader.after_reload(player_walk_anim.sprite_sheet_path, lambda: monster_system.set_frames(monster_frames()))
+entry_room = entry_position = None # room the player is in and where they entered it
+
+# --- Particles ---
+# the portal swirls and doors puff when they open, python particles.py benchmarks the pool
+particles = ParticleSystem()
+particle_room = None # particles belong to one room, they're dropped when you leave it
+open_doors = set() # doors the player stands at, a door bursts when it joins
 
 # open notes
+_open_notes_bodies = {}
+
 def open_notes(surface, text: str):
     # translucent fullscreen overlay
-    overlay = pg.Surface(surface.get_size(), pg.SRCALPHA)
+    overlay = surface_pool.acquire(surface.get_size(), pg.SRCALPHA, "overlays", clear=False)
     overlay.fill((0, 0, 0, 140))
 
     # panel
@@ -267,197 +1375,252 @@ def open_notes(surface, text: str):
     pg.draw.rect(overlay, (25, 25, 25, 255), panel, width=3, border_radius=16)
 
     # title/text
-    font = pg.font.Font(None, 48)
-    body = pg.font.Font(None, 32)
+    font = get_font(None, 48, sys_font=False)
+    body = get_font(None, 32, sys_font=False)
 
     title_surf = font.render("Note", True, (20, 20, 20))
     overlay.blit(title_surf, (panel.x + 24, panel.y + 20))
 
-    # simple word-wrap
-    def wrap(txt, width):
-        words, lines, line = txt.split(), [], ""
-        for w in words:
-            test = (line + " " + w).strip()
-            if body.size(test)[0] <= width: line = test
-            else: lines.append(line); line = w
-        if line: lines.append(line)
-        return lines
-
-    lines = wrap(text, panel.width - 48)
-    y = panel.y + 80
-    for ln in lines:
-        overlay.blit(body.render(ln, True, (30, 30, 30)), (panel.x + 24, y))
-        y += 36
+    # wrapped body is cached per text, so this doesn't re-wrap every call
+    body_surf = _open_notes_bodies.get(text)
+    if body_surf is None:
+        body_surf = _open_notes_bodies[text] = layout_text(text, body, panel.width - 48).render((30, 30, 30))
+    overlay.blit(body_surf, (panel.x + 24, panel.y + 80))
 
     # hint
-    hint = pg.font.Font(None, 28).render("Press E again to close", True, (60, 60, 60))
+    hint = get_font(None, 28, sys_font=False).render("Press E again to close", True, (60, 60, 60))
     overlay.blit(hint, (panel.x + 24, panel.bottom - 40))
 
     surface.blit(overlay, (0, 0))
+    surface_pool.release(overlay)
 
 notes_open = False
 toggled = False
 
+# --- Palette themes ---
+# Wall and floor textures are kept as 8-bit palette-indexed surfaces: one set of indices plus a 256 colour
+# palette, a quarter of the 32-bit memory. A room theme is just a different palette (set_palette, no pixel
+# copies), made by running the base palette through per-channel lookup tables, so new looks need no new art.
+def channel_lut(gain=1.0, gamma=1.0, invert=False):
+    """256-entry uint8 table for one colour channel"""
+    lut = (np.linspace(0, 1, 256) ** gamma * gain * 255).clip(0, 255)
+    if invert:
+        lut = 255 - lut
+    return lut.round().astype(np.uint8)
+
+# theme -> (which base channel feeds r, g, b; the table each output channel goes through)
+PALETTE_THEMES = {
+    "normal": ((0, 1, 2), [channel_lut()] * 3),
+    "dark": ((0, 1, 2), [channel_lut(0.55, 1.6), channel_lut(0.6, 1.6), channel_lut(0.8, 1.6)]),
+    "bugged": ((2, 0, 1), [channel_lut(invert=True)] * 3),
+}
+
+base_palettes = {} # indexed surface -> its own colours, (256, 3) uint8
+surface_themes = {} # indexed surface -> theme its palette currently shows
+
+def to_indexed(surface, into=None):
+    """
+    Copy of an RGBA surface as an 8-bit surface, transparent pixels become the colorkey.
+    into: an indexed surface of the same size to write it into instead (hot reload), it keeps its theme
+    """
+    rgb = pg.surfarray.pixels3d(surface).astype(np.uint32)
+    packed = rgb[..., 0] << 16 | rgb[..., 1] << 8 | rgb[..., 2]
+    del rgb
+    transparent = pg.surfarray.pixels_alpha(surface) < 128
+    packed[transparent] = 1 << 24 # sorts last, so it is the final palette entry
+    colors, indices = np.unique(packed, return_inverse=True)
+    if len(colors) > 256:
+        raise ValueError(f"{len(colors)} colours don't fit in an 8-bit palette")
+
+    palette = np.zeros((256, 3), np.uint8)
+    palette[:len(colors)] = np.stack([colors >> 16 & 255, colors >> 8 & 255, colors & 255], axis=1)
+    if into is None:
+        indexed = pg.Surface(surface.get_size(), 0, 8)
+        surface_themes[indexed] = "normal"
+        hot_reloader.derived(surface, indexed)
+    else:
+        indexed = into
+    base_palettes[indexed] = palette
+    indexed.set_palette(theme_palette(palette, surface_themes[indexed]).tolist())
+    pg.surfarray.blit_array(indexed, indices.reshape(packed.shape).astype(np.uint8))
+    indexed.set_colorkey(len(colors) - 1 if transparent.any() else None)
+    return indexed
+
+def theme_palette(base_palette, theme):
+    order, luts = PALETTE_THEMES[theme]
+    return np.stack([luts[i][base_palette[:, channel]] for i, channel in enumerate(order)], axis=1)
+
+def set_theme(surfaces, theme):
+    """Swap the palette of indexed surfaces, the pixels stay where they are"""
+    for surface in surfaces:
+        if surface_themes[surface] != theme:
+            surface.set_palette(theme_palette(base_palettes[surface], theme).tolist())
+            surface_themes[surface] = theme
+
 # --- Load textures ---
 current_level = 1
-house_wall_texture = pg.image.load("sprites/house_wall_texture_exterior.png")
-house_wall_texture = pg.transform.scale(house_wall_texture, (house_wall_texture.get_width()*6, house_wall_texture.get_height()*6))
-interior_wall_texture = pg.image.load("sprites/interior_wall_texture.png")
-interior_wall_texture = pg.transform.scale(interior_wall_texture, (interior_wall_texture.get_width()*6, interior_wall_texture.get_height()*6))
-house_floor_texture = pg.image.load("sprites/house_floor_texture.png")
-house_floor_texture = pg.transform.scale(house_floor_texture, (house_floor_texture.get_width()*6, house_floor_texture.get_height()*6))
-bugged_wall_texture = pg.image.load("sprites/bugged_wall.png")
-bugged_wall_texture = pg.transform.scale(bugged_wall_texture, (bugged_wall_texture.get_width()*6, bugged_wall_texture.get_height()*6))
-bugged_floor_texture = pg.image.load("sprites/bugged_floor.png")
-bugged_floor_texture = pg.transform.scale(bugged_floor_texture, (bugged_floor_texture.get_width()*6, bugged_floor_texture.get_height()*6))
+house_wall_texture = to_indexed(load_sprite("sprites/house_wall_texture_exterior.png", 6))
+interior_wall_texture = to_indexed(load_sprite("sprites/interior_wall_texture.png", 6))
+house_floor_texture = to_indexed(load_sprite("sprites/house_floor_texture.png", 6))
+bugged_wall_texture = to_indexed(load_sprite("sprites/bugged_wall.png", 6))
+bugged_floor_texture = to_indexed(load_sprite("sprites/bugged_floor.png", 6))
+themed_textures = [house_wall_texture, interior_wall_texture, house_floor_texture, bugged_wall_texture, bugged_floor_texture]
+# level -> palette theme of its walls and floors, python thegame.py --theme=dark shows one theme everywhere
+room_themes = {}
+preview_theme = parse_flag(sys.argv, "--theme", "dark", str)
+if preview_theme and preview_theme not in PALETTE_THEMES:
+    sys.exit(f"Unknown theme {preview_theme!r}, --theme takes one of: {', '.join(PALETTE_THEMES)}")
+glitch_levels = [4] # rooms that get the glitch post-effect on top
+glitch_effect = GlitchEffect(scale=1 / RENDER_SCALE)
 
 # --- Build level into one surface ---
 def build_level(current_level, current_direction):
+    set_theme(themed_textures, preview_theme or room_themes.get(current_level, "normal"))
     if current_level == 0:
         # size can be bigger if you want a larger map
-        level_surface = pg.Surface((1920, 1080), pg.SRCALPHA)
+        level_surface = surface_pool.acquire(to_canvas((1920, 1080)), pg.SRCALPHA, "level")
 
         # draw all tiles onto this surface once
-        level_surface.blit(interior_wall_texture, (929, 40))
-        level_surface.blit(interior_wall_texture, (305, 40))
+        level_surface.blit(interior_wall_texture, to_canvas((929, 40)))
+        level_surface.blit(interior_wall_texture, to_canvas((305, 40)))
 
-        level_surface.blit(house_floor_texture, (329, 424))
-        level_surface.blit(house_floor_texture, (947, 424))
-        level_surface.blit(house_floor_texture, (959, 424))
-        level_surface.blit(house_floor_texture, (329, 635))
-        level_surface.blit(house_floor_texture, (947, 635))
-        level_surface.blit(house_floor_texture, (959, 635))
+        level_surface.blit(house_floor_texture, to_canvas((329, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((947, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((959, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((329, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((947, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((959, 635)))
 
         # define hitboxes separately (world coordinates, not tied to drawing)
         hitboxes = {
             "walls": [
-                pg.Rect(929, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
-                pg.Rect(305, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
+                pg.Rect(929, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
+                pg.Rect(305, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
             ]
         }
     elif current_level == 1:
         # size can be bigger if you want a larger map
-        level_surface = pg.Surface((2200, 1080), pg.SRCALPHA)
+        level_surface = surface_pool.acquire(to_canvas((2200, 1080)), pg.SRCALPHA, "level")
 
         # draw all tiles onto this surface once
-        level_surface.blit(interior_wall_texture, (305, 40))
-        level_surface.blit(interior_wall_texture, (929, 40))
-        level_surface.blit(interior_wall_texture, (1705, 40))
-
-        level_surface.blit(house_floor_texture, (329, 424))
-        level_surface.blit(house_floor_texture, (947, 424))
-        level_surface.blit(house_floor_texture, (959, 424))
-        level_surface.blit(house_floor_texture, (329, 635))
-        level_surface.blit(house_floor_texture, (947, 635))
-        level_surface.blit(house_floor_texture, (959, 635))
-        level_surface.blit(house_floor_texture, (1729, 424))
-        level_surface.blit(house_floor_texture, (1729, 635))
+        level_surface.blit(interior_wall_texture, to_canvas((305, 40)))
+        level_surface.blit(interior_wall_texture, to_canvas((929, 40)))
+        level_surface.blit(interior_wall_texture, to_canvas((1705, 40)))
+
+        level_surface.blit(house_floor_texture, to_canvas((329, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((947, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((959, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((329, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((947, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((959, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((1729, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((1729, 635)))
 
         # define hitboxes separately (world coordinates, not tied to drawing)
         hitboxes = {
             "walls": [
-                pg.Rect(929, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
-                pg.Rect(305, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
-                pg.Rect(1553, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
+                pg.Rect(929, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
+                pg.Rect(305, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
+                pg.Rect(1553, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
                 pg.Rect(0, 850, 2200, 20),
                 pg.Rect(310, 200, 20, 900),
-                pg.Rect(1553, 300, 200, interior_wall_texture.get_height()+200)
+                pg.Rect(1553, 300, 200, world_height(interior_wall_texture)+200)
             ]
         }
 
         if current_direction == 'd':
-            level_surface.blit(house_floor_texture, (1400, 424))
-            level_surface.blit(house_floor_texture, (1400, 635))
+            level_surface.blit(house_floor_texture, to_canvas((1400, 424)))
+            level_surface.blit(house_floor_texture, to_canvas((1400, 635)))
 
             hitboxes = {
                 "walls": [
-                    pg.Rect(929, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
-                    pg.Rect(305, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
-                    pg.Rect(1553, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
+                    pg.Rect(929, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
+                    pg.Rect(305, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
+                    pg.Rect(1553, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
                     pg.Rect(0, 850, 2200, 20),
                     pg.Rect(310, 200, 20, 900),
                 ]
             }
     elif current_level == 2:
-        level_surface = pg.Surface((1920, 1080))
-        level_surface.blit(interior_wall_texture, (250, 40))
-        level_surface.blit(interior_wall_texture, (624+250, 40))
+        level_surface = surface_pool.acquire(to_canvas((1920, 1080)), 0, "level")
+        level_surface.blit(interior_wall_texture, to_canvas((250, 40)))
+        level_surface.blit(interior_wall_texture, to_canvas((624+250, 40)))
 
-        level_surface.blit(house_floor_texture, (274, 424))
-        level_surface.blit(house_floor_texture, (878, 424))
-        level_surface.blit(house_floor_texture, (904, 424))
+        level_surface.blit(house_floor_texture, to_canvas((274, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((878, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((904, 424)))
 
         hitboxes = {
             "walls": [
-                pg.Rect(250, 40, interior_wall_texture.get_width()*2, interior_wall_texture.get_height()-75),
-                pg.Rect(210, 400, 50, house_floor_texture.get_height()*2),
-                pg.Rect(1520, 400, 50, house_floor_texture.get_height()*2),
+                pg.Rect(250, 40, world_width(interior_wall_texture)*2, world_height(interior_wall_texture)-75),
+                pg.Rect(210, 400, 50, world_height(house_floor_texture)*2),
+                pg.Rect(1520, 400, 50, world_height(house_floor_texture)*2),
                 pg.Rect(210, 640, 1600, 50)
             ]
         }
     elif current_level == 3:
-        level_surface = pg.Surface((1920+2575, 1080))
+        level_surface = surface_pool.acquire(to_canvas((1920+2575, 1080)), 0, "level")
 
-        level_surface.blit(interior_wall_texture, (305+1000, 40))
-        level_surface.blit(interior_wall_texture, (929+1000, 40))
+        level_surface.blit(interior_wall_texture, to_canvas((305+1000, 40)))
+        level_surface.blit(interior_wall_texture, to_canvas((929+1000, 40)))
 
-        level_surface.blit(house_floor_texture, (329+1000, 424))
-        level_surface.blit(house_floor_texture, (947+1000, 424))
-        level_surface.blit(house_floor_texture, (959+1000, 424))
-        level_surface.blit(house_floor_texture, (329+1000, 635))
-        level_surface.blit(house_floor_texture, (947+1000, 635))
-        level_surface.blit(house_floor_texture, (959+1000, 635))
+        level_surface.blit(house_floor_texture, to_canvas((329+1000, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((947+1000, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((959+1000, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((329+1000, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((947+1000, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((959+1000, 635)))
 
         hitboxes = {
             "walls": [
-                pg.Rect(929+1000, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
-                pg.Rect(305+1000, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
+                pg.Rect(929+1000, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
+                pg.Rect(305+1000, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
                 pg.Rect(1000, 850, 2200, 20),
                 pg.Rect(310+1000, 200, 20, 900),
-                pg.Rect(1575+1000, 300, 200, interior_wall_texture.get_height()+200)
+                pg.Rect(1575+1000, 300, 200, world_height(interior_wall_texture)+200)
             ]
         }
     
     elif current_level == 4:
-        level_surface = pg.Surface((3000, 1080))
+        level_surface = surface_pool.acquire(to_canvas((3000, 1080)), 0, "level")
 
-        level_surface.blit(bugged_wall_texture, (1605, 40))
-        level_surface.blit(bugged_wall_texture, (2229, 40))
+        level_surface.blit(bugged_wall_texture, to_canvas((1605, 40)))
+        level_surface.blit(bugged_wall_texture, to_canvas((2229, 40)))
 
-        level_surface.blit(bugged_floor_texture, (329+1300, 424))
-        level_surface.blit(bugged_floor_texture, (947+1300, 424))
-        level_surface.blit(bugged_floor_texture, (959+1300, 424))
-        level_surface.blit(bugged_floor_texture, (329+1300, 635))
-        level_surface.blit(bugged_floor_texture, (947+1300, 635))
-        level_surface.blit(bugged_floor_texture, (959+1300, 635))
+        level_surface.blit(bugged_floor_texture, to_canvas((329+1300, 424)))
+        level_surface.blit(bugged_floor_texture, to_canvas((947+1300, 424)))
+        level_surface.blit(bugged_floor_texture, to_canvas((959+1300, 424)))
+        level_surface.blit(bugged_floor_texture, to_canvas((329+1300, 635)))
+        level_surface.blit(bugged_floor_texture, to_canvas((947+1300, 635)))
+        level_surface.blit(bugged_floor_texture, to_canvas((959+1300, 635)))
 
         hitboxes = {"walls": [
             pg.Rect(1635, 0, 20, 1080),
             pg.Rect(2100, 0, 20, 1080),
-            pg.Rect(1605, 40, interior_wall_texture.get_width()*2, interior_wall_texture.get_height()-75),
+            pg.Rect(1605, 40, world_width(interior_wall_texture)*2, world_height(interior_wall_texture)-75),
             pg.Rect(1605, 1020, 900, 30)
         ]}
 
     elif current_level == 5:
-        level_surface = pg.Surface((1920+2575, 1080))
+        level_surface = surface_pool.acquire(to_canvas((1920+2575, 1080)), 0, "level")
 
-        level_surface.blit(interior_wall_texture, (305+1000, 40))
-        level_surface.blit(interior_wall_texture, (929+1000, 40))
+        level_surface.blit(interior_wall_texture, to_canvas((305+1000, 40)))
+        level_surface.blit(interior_wall_texture, to_canvas((929+1000, 40)))
 
-        level_surface.blit(house_floor_texture, (329+1000, 424))
-        level_surface.blit(house_floor_texture, (947+1000, 424))
-        level_surface.blit(house_floor_texture, (959+1000, 424))
-        level_surface.blit(house_floor_texture, (329+1000, 635))
-        level_surface.blit(house_floor_texture, (947+1000, 635))
-        level_surface.blit(house_floor_texture, (959+1000, 635))
+        level_surface.blit(house_floor_texture, to_canvas((329+1000, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((947+1000, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((959+1000, 424)))
+        level_surface.blit(house_floor_texture, to_canvas((329+1000, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((947+1000, 635)))
+        level_surface.blit(house_floor_texture, to_canvas((959+1000, 635)))
 
         hitboxes = {
             "walls": [
-                pg.Rect(929+1000, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
-                pg.Rect(305+1000, 40, interior_wall_texture.get_width(), interior_wall_texture.get_height()-75),
+                pg.Rect(929+1000, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
+                pg.Rect(305+1000, 40, world_width(interior_wall_texture), world_height(interior_wall_texture)-75),
                 pg.Rect(1000, 850, 2200, 20),
                 # pg.Rect(310+1000, 200, 20, 900),
-                pg.Rect(1575+1000, 300, 200, interior_wall_texture.get_height()+200)
+                pg.Rect(1575+1000, 300, 200, world_height(interior_wall_texture)+200)
             ]
         }
 
@@ -470,41 +1633,40 @@ level_y = 0
 # Build furniture
 current_direction = 'w'
 
-bedside_table_1_shelf = pg.image.load('sprites/bedside_table_1_shelf.png').convert_alpha()
-bedside_table_1_shelf = pg.transform.scale(bedside_table_1_shelf, (bedside_table_1_shelf.get_width()*3, bedside_table_1_shelf.get_height()*3))
-bedside_table_11_shelf = pg.image.load('sprites/bedside_table_11_shelf.png').convert_alpha()
-bedside_table_11_shelf = pg.transform.scale(bedside_table_11_shelf, (bedside_table_11_shelf.get_width()*3, bedside_table_11_shelf.get_height()*3))
-bedside_table_2_shelf = pg.image.load('sprites/bedside_table_2_shelf.png').convert_alpha()
-bedside_table_2_shelf = pg.transform.scale(bedside_table_2_shelf, (bedside_table_2_shelf.get_width()*3, bedside_table_2_shelf.get_height()*3))
-bedside_table_21_shelf = pg.image.load('sprites/bedside_table_21_shelf.png').convert_alpha()
-bedside_table_21_shelf = pg.transform.scale(bedside_table_21_shelf, (bedside_table_21_shelf.get_width()*3, bedside_table_21_shelf.get_width()*3))
-bedside_table_22_shelf = pg.image.load('sprites/bedside_table_22_shelf.png').convert_alpha()
-bedside_table_22_shelf = pg.transform.scale(bedside_table_22_shelf, (bedside_table_22_shelf.get_width()*3, bedside_table_22_shelf.get_height()*3))
-door_image = pg.image.load('sprites/door.png').convert_alpha()
-door_image = pg.transform.scale(door_image, (door_image.get_width()*3, door_image.get_height()*3))
-door_opened_image = pg.image.load('sprites/door_opened.png').convert_alpha()
-door_opened_image = pg.transform.scale(door_opened_image, (door_opened_image.get_width()*3, door_opened_image.get_height()*3))
-key_image = pg.image.load('sprites/key.png').convert_alpha()
-lock = pg.image.load('sprites/lock.png').convert_alpha()
+bedside_table_1_shelf = load_sprite('sprites/bedside_table_1_shelf.png', 3)
+bedside_table_11_shelf = load_sprite('sprites/bedside_table_11_shelf.png', 3)
+bedside_table_2_shelf = load_sprite('sprites/bedside_table_2_shelf.png', 3)
+bedside_table_21_shelf = load_sprite('sprites/bedside_table_21_shelf.png', 3)
+bedside_table_22_shelf = load_sprite('sprites/bedside_table_22_shelf.png', 3)
+door_image = load_sprite('sprites/door.png', 3)
+door_opened_image = load_sprite('sprites/door_opened.png', 3)
+key_image = load_sprite('sprites/key.png')
+lock = load_sprite('sprites/lock.png')
 note = Note(screen, 'test note')
-note_item = pg.image.load('sprites/note_item.png')
-portal_image = pg.image.load("sprites/portal.png")
-portal_image = pg.transform.scale(portal_image, (portal_image.get_width()*3, portal_image.get_height()*3))
+note_item = load_sprite('sprites/note_item.png')
+
+def rotate_note_item():
+    """Hidden notes lie sideways in the drawers"""
+    global note_item_in_drawer
+    note_item_in_drawer = pg.transform.rotate(note_item, 90.0)
+
+rotate_note_item()
+hot_reloader.after_reload('sprites/note_item.png', rotate_note_item)
+portal_image = load_sprite("sprites/portal.png", 3)
 
 def build_furniture(direction, current_level):
-    note_item = pg.image.load('sprites/note_item.png')
-    note_item = pg.transform.rotate(note_item, 90.0)
+    note_item = note_item_in_drawer
 
     if current_level == 0:
-        furniture_surface = pg.Surface((1920, 1080), pg.SRCALPHA)
+        furniture_surface = surface_pool.acquire(to_canvas((1920, 1080)), pg.SRCALPHA, "furniture")
 
         if direction == 'w':
-            furniture_surface.blit(bedside_table_1_shelf, (500, 320))
-            furniture_surface.blit(bedside_table_2_shelf, (900, 320))
+            furniture_surface.blit(bedside_table_1_shelf, to_canvas((500, 320)))
+            furniture_surface.blit(bedside_table_2_shelf, to_canvas((900, 320)))
 
             furniture_hitboxes = {
                 'shelf': [
-                    pg.Rect(500, 320, bedside_table_1_shelf.get_width(), bedside_table_1_shelf.get_height()-130),
+                    pg.Rect(500, 320, world_width(bedside_table_1_shelf), world_height(bedside_table_1_shelf)-130),
                     pg.Rect(540, 415, 112, 40),
                     bedside_table_11_shelf,
                     (500, 320),
@@ -528,7 +1690,7 @@ def build_furniture(direction, current_level):
                     '0'
                 ]
                 # 'shelf_2': [
-                #     pg.Rect(0, 320, bedside_table_1_shelf.get_width(), bedside_table_1_shelf.get_height()-130),
+                #     pg.Rect(0, 320, world_width(bedside_table_1_shelf), world_height(bedside_table_1_shelf)-130),
                 #     pg.Rect(40, 415, 112, 40),
                 #     bedside_table_11_shelf,
                 #     (0, 320),
@@ -545,8 +1707,8 @@ def build_furniture(direction, current_level):
                 # ] # This is how the note looks like
             }    
         elif direction == 'd':
-            furniture_surface.blit(bedside_table_1_shelf, (700, 320))
-            furniture_surface.blit(door_image, (1200, 230))
+            furniture_surface.blit(bedside_table_1_shelf, to_canvas((700, 320)))
+            furniture_surface.blit(door_image, to_canvas((1200, 230)))
 
             furniture_hitboxes = {
                 'shelf': [
@@ -560,7 +1722,7 @@ def build_furniture(direction, current_level):
                     True
                 ],
                 'shelf_1': [
-                    pg.Rect(700, 320, bedside_table_1_shelf.get_width(), bedside_table_1_shelf.get_height()-130),
+                    pg.Rect(700, 320, world_width(bedside_table_1_shelf), world_height(bedside_table_1_shelf)-130),
                     pg.Rect(740, 415, 112, 40),
                     bedside_table_11_shelf,
                     (700, 320),
@@ -574,7 +1736,7 @@ def build_furniture(direction, current_level):
                     '0'
                 ],
                 'door_locked1': [
-                    pg.Rect(1150, 180, door_image.get_width()+100, door_image.get_height()+100),
+                    pg.Rect(1150, 180, world_width(door_image)+100, world_height(door_image)+100),
                     door_opened_image,
                     (1200, 230),
                     False,
@@ -594,11 +1756,11 @@ def build_furniture(direction, current_level):
                 
             }
         elif direction == 'a':
-            furniture_surface.blit(bedside_table_1_shelf, (850, 320))
+            furniture_surface.blit(bedside_table_1_shelf, to_canvas((850, 320)))
 
             furniture_hitboxes = {
                 "shelf_3": [
-                    pg.Rect(850, 320, bedside_table_11_shelf.get_width(), bedside_table_11_shelf.get_height()-130),
+                    pg.Rect(850, 320, world_width(bedside_table_11_shelf), world_height(bedside_table_11_shelf)-130),
                     pg.Rect(890, 415, 112, 40),
                     bedside_table_11_shelf,
                     (850, 320),
@@ -609,18 +1771,18 @@ def build_furniture(direction, current_level):
                 ]
             }
     elif current_level == 1:
-        furniture_surface = pg.Surface((2200, 1080), pg.SRCALPHA)
+        furniture_surface = surface_pool.acquire(to_canvas((2200, 1080)), pg.SRCALPHA, "furniture")
         furniture_hitboxes = {}
 
         if direction == 'w':
-            furniture_surface.blit(door_image, (400, 230))
-            furniture_surface.blit(door_image, (1100, 230))
-            furniture_surface.blit(door_image, (1900, 230))
-            furniture_surface.blit(bedside_table_1_shelf, (800, 320))
+            furniture_surface.blit(door_image, to_canvas((400, 230)))
+            furniture_surface.blit(door_image, to_canvas((1100, 230)))
+            furniture_surface.blit(door_image, to_canvas((1900, 230)))
+            furniture_surface.blit(bedside_table_1_shelf, to_canvas((800, 320)))
 
             furniture_hitboxes = {
                 "door1": [
-                    pg.Rect(350, 180, door_image.get_width()+100, door_image.get_height()+100),
+                    pg.Rect(350, 180, world_width(door_image)+100, world_height(door_image)+100),
                     door_opened_image,
                     (400, 230),
                     True,
@@ -629,7 +1791,7 @@ def build_furniture(direction, current_level):
                     0
                 ],
                 "door2": [
-                    pg.Rect(1050, 180, door_image.get_width()+100, door_image.get_height()+100),
+                    pg.Rect(1050, 180, world_width(door_image)+100, world_height(door_image)+100),
                     door_opened_image,
                     (1100, 230),
                     True,
@@ -638,7 +1800,7 @@ def build_furniture(direction, current_level):
                     2
                 ],
                 "shelf_2": [
-                    pg.Rect(800, 320, bedside_table_1_shelf.get_width(), bedside_table_1_shelf.get_height()-130),
+                    pg.Rect(800, 320, world_width(bedside_table_1_shelf), world_height(bedside_table_1_shelf)-130),
                     pg.Rect(840, 415, 112, 40),
                     bedside_table_11_shelf,
                     (800, 320),
@@ -655,7 +1817,7 @@ def build_furniture(direction, current_level):
                     "hidden_note2"
                 ],
                 "door3": [
-                    pg.Rect(1850, 180, door_image.get_width()+100, door_image.get_height()+100),
+                    pg.Rect(1850, 180, world_width(door_image)+100, world_height(door_image)+100),
                     door_opened_image,
                     (1900, 230),
                     True,
@@ -670,11 +1832,11 @@ def build_furniture(direction, current_level):
                 ]
             }    
         elif direction == 'd':
-            furniture_surface.blit(door_image, (1900, 230))
+            furniture_surface.blit(door_image, to_canvas((1900, 230)))
 
             furniture_hitboxes = {
                 "door_locked2": [
-                    pg.Rect(1850, 180, door_image.get_width()+100, door_image.get_height()+100),
+                    pg.Rect(1850, 180, world_width(door_image)+100, world_height(door_image)+100),
                     door_opened_image,
                     (1900, 230),
                     False,
@@ -699,16 +1861,16 @@ def build_furniture(direction, current_level):
             }
 
     elif current_level == 2:
-        furniture_surface = pg.Surface((1920, 1080), pg.SRCALPHA)
+        furniture_surface = surface_pool.acquire(to_canvas((1920, 1080)), pg.SRCALPHA, "furniture")
         furniture_hitboxes = {}
 
         if current_direction == 'w':
-            furniture_surface.blit(bedside_table_1_shelf, (800, 320))
-            furniture_surface.blit(door_image, (1100, 230))
+            furniture_surface.blit(bedside_table_1_shelf, to_canvas((800, 320)))
+            furniture_surface.blit(door_image, to_canvas((1100, 230)))
 
             furniture_hitboxes = {
                 "shelf_4": [
-                    pg.Rect(800, 320, bedside_table_1_shelf.get_width(), bedside_table_1_shelf.get_height()-130),
+                    pg.Rect(800, 320, world_width(bedside_table_1_shelf), world_height(bedside_table_1_shelf)-130),
                     pg.Rect(840, 415, 112, 40),
                     bedside_table_11_shelf,
                     (800, 320),
@@ -725,7 +1887,7 @@ def build_furniture(direction, current_level):
                     'hidden_note7'
                 ],
                 "door5": [
-                    pg.Rect(1050, 180, door_image.get_width()+100, door_image.get_height()+100),
+                    pg.Rect(1050, 180, world_width(door_image)+100, world_height(door_image)+100),
                     opened_door_image,
                     (1100, 230),
                     True,
@@ -736,11 +1898,11 @@ def build_furniture(direction, current_level):
             }
         
         elif current_direction == 's':
-            furniture_surface.blit(bedside_table_1_shelf, (800, 320))
+            furniture_surface.blit(bedside_table_1_shelf, to_canvas((800, 320)))
 
             furniture_hitboxes = {
                 "shelf_5": [
-                    pg.Rect(800, 320, bedside_table_1_shelf.get_width(), bedside_table_1_shelf.get_height()-130),
+                    pg.Rect(800, 320, world_width(bedside_table_1_shelf), world_height(bedside_table_1_shelf)-130),
                     pg.Rect(840, 415, 112, 40),
                     bedside_table_11_shelf,
                     (800, 320),
@@ -752,15 +1914,15 @@ def build_furniture(direction, current_level):
             }
 
     elif current_level == 3:
-        furniture_surface = pg.Surface((2000, 1080), pg.SRCALPHA)
+        furniture_surface = surface_pool.acquire(to_canvas((2000, 1080)), pg.SRCALPHA, "furniture")
         furniture_hitboxes = {}
 
         if direction == "w":
-            furniture_surface.blit(door_image, (1659, 230))
+            furniture_surface.blit(door_image, to_canvas((1659, 230)))
 
             furniture_hitboxes = {
                 "door5": [
-                    pg.Rect(1609, 180, door_image.get_width()+100, door_image.get_height()+100),
+                    pg.Rect(1609, 180, world_width(door_image)+100, world_height(door_image)+100),
                     opened_door_image,
                     (1659, 230),
                     True,
@@ -771,11 +1933,11 @@ def build_furniture(direction, current_level):
             }
 
         elif direction == 'd':
-            furniture_surface.blit(door_image, (1800, 230))
+            furniture_surface.blit(door_image, to_canvas((1800, 230)))
 
             furniture_hitboxes = {
                 "door_locked3": [
-                    pg.Rect(1750, 180, door_image.get_width()+100, door_image.get_height()+100),
+                    pg.Rect(1750, 180, world_width(door_image)+100, world_height(door_image)+100),
                     opened_door_image,
                     (1800, 230),
                     False,
@@ -791,13 +1953,13 @@ def build_furniture(direction, current_level):
             }
 
     elif current_level == 4:
-        furniture_surface = pg.Surface((2000, 1080), pg.SRCALPHA)
+        furniture_surface = surface_pool.acquire(to_canvas((2000, 1080)), pg.SRCALPHA, "furniture")
 
-        furniture_surface.blit(door_image, (1800, 230))
+        furniture_surface.blit(door_image, to_canvas((1800, 230)))
 
         furniture_hitboxes = {
             "door6": [
-                pg.Rect(1750, 180, door_image.get_width()+100, door_image.get_height()+100),
+                pg.Rect(1750, 180, world_width(door_image)+100, world_height(door_image)+100),
                 door_opened_image,
                 (1800, 230),
                 True,
@@ -807,9 +1969,9 @@ def build_furniture(direction, current_level):
             ]
         }
     elif current_level == 5:
-        furniture_surface = pg.Surface((2500, 1080), pg.SRCALPHA)
+        furniture_surface = surface_pool.acquire(to_canvas((2500, 1080)), pg.SRCALPHA, "furniture")
         
-        furniture_surface.blit(portal_image, (1800, 500))
+        furniture_surface.blit(portal_image, to_canvas((1800, 500)))
 
         furniture_hitboxes = {
             "portal": [
@@ -833,24 +1995,24 @@ def lock_logic(furniture_hitboxes, lock_name, key_name, binded_item_id):
 
 def build_items(direction, current_level):
     if current_level == 0:
-        items_surface = pg.Surface((1920, 1080), pg.SRCALPHA)
+        items_surface = surface_pool.acquire(to_canvas((1920, 1080)), pg.SRCALPHA, "items")
 
         if direction == 'w':
-            items_surface.blit(note_item, (600, 350))
-            items_surface.blit(pg.transform.rotate(note_item, 36.0), (1000, 370))
+            items_surface.blit(note_item, to_canvas((600, 350)))
+            items_surface.blit(pg.transform.rotate(note_item, 36.0), to_canvas((1000, 370)))
 
             items_hitboxes = {
                 'item_note': [pg.Rect(470, 230, 250, 200)],
                 'item_note4': [pg.Rect(870, 230, 250, 200)]
             }
         elif direction == 'd':
-            items_surface.blit(note_item, (800, 350))
+            items_surface.blit(note_item, to_canvas((800, 350)))
 
             items_hitboxes = {
                 'item_note1': [pg.Rect(670, 230, 250, 200)]
             }
         elif direction == 's':
-            items_surface.blit(note_item, (700, 350))
+            items_surface.blit(note_item, to_canvas((700, 350)))
 
             items_hitboxes = {
                 'item_note2': [pg.Rect(570, 230, 250, 200)]
@@ -863,16 +2025,16 @@ def build_items(direction, current_level):
             }
 
     elif current_level == 1:
-        items_surface = pg.Surface((2200, 1080), pg.SRCALPHA)
+        items_surface = surface_pool.acquire(to_canvas((2200, 1080)), pg.SRCALPHA, "items")
 
         if direction == 'w':
-            items_surface.blit(pg.transform.rotate(note_item, 56.0), (910, 695))
+            items_surface.blit(pg.transform.rotate(note_item, 56.0), to_canvas((910, 695)))
 
             items_hitboxes = {
                 'item_note5': [pg.Rect(800, 600, 250, 200)]
             }
         elif direction == 'd':
-            items_surface.blit(pg.transform.rotate(note_item, 234.0), (1200, 600))
+            items_surface.blit(pg.transform.rotate(note_item, 234.0), to_canvas((1200, 600)))
 
             items_hitboxes = {
                 "item_note6": [pg.Rect(1090, 505, 250, 200)]
@@ -889,7 +2051,7 @@ def build_items(direction, current_level):
             }
     
     elif current_level == 2:
-        items_surface = pg.Surface((1920, 1080), pg.SRCALPHA)
+        items_surface = surface_pool.acquire(to_canvas((1920, 1080)), pg.SRCALPHA, "items")
 
         if direction == 'w':
             
@@ -905,10 +2067,10 @@ def build_items(direction, current_level):
             items_hitboxes = {}
     
     elif current_level == 3:
-        items_surface = pg.Surface((3000, 1080), pg.SRCALPHA)
+        items_surface = surface_pool.acquire(to_canvas((3000, 1080)), pg.SRCALPHA, "items")
 
         if direction == 'w':
-            items_surface.blit(note_item, (2500, 500))
+            items_surface.blit(note_item, to_canvas((2500, 500)))
             
             items_hitboxes = {
                 "item_note9": [pg.Rect(2370, 420, 250, 200)]
@@ -917,7 +2079,7 @@ def build_items(direction, current_level):
             
             items_hitboxes = {}
         if direction == 's':
-            items_surface.blit(note_item, (1930, 700))
+            items_surface.blit(note_item, to_canvas((1930, 700)))
             
             items_hitboxes = {
                 "item_note7": [pg.Rect(1800, 640, 250, 200)]
@@ -927,16 +2089,16 @@ def build_items(direction, current_level):
             items_hitboxes = {}
     
     elif current_level == 4:
-        items_surface = pg.Surface((3000, 1080), pg.SRCALPHA)
+        items_surface = surface_pool.acquire(to_canvas((3000, 1080)), pg.SRCALPHA, "items")
 
-        items_surface.blit(note_item, (1850, 800))
+        items_surface.blit(note_item, to_canvas((1850, 800)))
 
         items_hitboxes = {
             "item_note8": [pg.Rect(1720, 720, 250, 200)]
         }
     
     elif current_level == 5:
-        items_surface = pg.Surface((1, 1), pg.SRCALPHA)
+        items_surface = surface_pool.acquire(to_canvas((1, 1)), pg.SRCALPHA, "items")
         items_hitboxes = {}
 
     return items_surface, items_hitboxes
@@ -963,7 +2125,7 @@ items_with_notesD = {
 }
 
 items_with_notesS = {
-    "item_note7": Note(screen, "00110111 01000001 00100000 00110110 01000110 00100000 00110110 00110111 00100000 00110110 00111000 00100000 00110010 00110000 00100000 00110010 01000100 00100000 00110010 00110000 00100000 00110110 00110110 00100000 00110111 00110111 00100000 00110111 00110101 00100000 00110111 00110110 00100000 00110110 00111000"),
+    "item_note7": Note(screen, puzzle_note("last - right", 14, ("hex", "binary"))),
     "hidden_note7": Note(screen, "Only UP - is a game where while you are playing, you might just sell your pc to the window."),
     "item_note8": Note(screen, "Try to press left-arrow key now.\n\n\n\n\n\t\t\t\tCOME ON! ESCAPE NOW!!!\n\nGrap the key in the tutorial room. And please hurry up unitll they get there!!"),
     "hidden_note2": Note(screen, "Literally changed my UI to German everywhere.")
@@ -999,6 +2161,229 @@ def draw_debug_hitboxes():
     # player = yellow
     pg.draw.rect(screen, (255, 255, 0), player_hitbox, 2)
 
+# Hidden notes
+def scan_hidden_notes(furniture_hitboxes, items_hitboxes, checking_drawer):
+    """Put all hidden notes of the opened drawers into items_hitboxes"""
+    for hitbox in hidden_notes:
+        for key, obj in furniture_hitboxes.items():
+            if key.startswith("shelf") and len(obj) > 12:
+                if hitbox[0] == obj[14]:
+                    if checking_drawer:
+                        items_hitboxes[hitbox[0]] = hitbox[1]
+                    else:
+                        items_hitboxes.pop(key, None)
+
+# --- CollisionGrid class ---
+
+class CollisionGrid:
+    def __init__(self, rects, cell_size=256):
+        """Spatial hash of a room's solid rects (level coordinates), query() only looks at the cells a rect touches"""
+        self.cell_size = cell_size
+        self.rects = [rect for rect in rects if rect.width and rect.height]
+        self.cells = {} # (cx, cy) -> [rects]
+        for rect in self.rects:
+            for cell in self._cells(rect):
+                self.cells.setdefault(cell, []).append(rect)
+
+    def _cells(self, rect):
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cx, cy
+
+    def query(self, rect):
+        """Solids that may touch rect, each one once"""
+        found = {}
+        for cell in self._cells(rect):
+            for solid in self.cells.get(cell, ()):
+                found[id(solid)] = solid
+        return list(found.values())
+
+_collision_grids = {} # (level, direction) -> CollisionGrid
+
+def get_collision_grid(room, hitboxes, furniture_hitboxes):
+    """Walls and shelves never move, so a room's grid is built the first time the room is entered"""
+    grid = _collision_grids.get(room)
+    if grid is None:
+        solids = hitboxes["walls"] + [obj[0] for key, obj in furniture_hitboxes.items() if key.startswith("shelf")]
+        grid = _collision_grids[room] = CollisionGrid(solids)
+    return grid
+
+def push_out(rect, grid, tries=4):
+    """
+    rect moved out of the solids of grid it overlaps, each time by the shortest way out (minimum translation).
+    Loading, rewinding or a room change can put the player inside a wall, sweep_aabb needs a free start.
+    """
+    rect = rect.copy()
+    for _ in range(tries):
+        hit = [solid for solid in grid.query(rect) if rect.colliderect(solid)]
+        if not hit:
+            break
+        for solid in hit:
+            if rect.colliderect(solid):
+                ways_out = [(solid.left - rect.right, 0), (solid.right - rect.left, 0), (0, solid.top - rect.bottom), (0, solid.bottom - rect.top)]
+                rect.move_ip(min(ways_out, key=lambda way: abs(way[0]) + abs(way[1])))
+    return rect
+
+def sweep_aabb(rect, dx, dy, solids):
+    """
+    Move rect by dx, then by dy, each axis stops at the first solid on its way (earliest time of impact),
+    so however long the frame was nothing is skipped. rect has to start outside the solids (push_out).
+    Returns the resolved topleft of rect.
+    """
+    left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+    if dx:
+        for solid in solids:
+            if top < solid.bottom and bottom > solid.top:
+                if dx > 0 and right <= solid.left < right + dx:
+                    dx = solid.left - right
+                elif dx < 0 and left + dx < solid.right <= left:
+                    dx = solid.right - left
+        left += dx
+        right += dx
+    if dy:
+        for solid in solids:
+            if left < solid.right and right > solid.left:
+                if dy > 0 and bottom <= solid.top < bottom + dy:
+                    dy = solid.top - bottom
+                elif dy < 0 and top + dy < solid.bottom <= top:
+                    dy = solid.bottom - top
+        top += dy
+    return left, top
+
+# --- NavGrid class ---
+
+NAV_NEIGHBOURS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1)]
+
+class NavGrid:
+    def __init__(self, solids, width, agent_size, cell=8, nav_cell=32):
+        """
+        A room's solids rasterised once for agents of agent_size (level coordinates):
+        mask: cell px cells, True = blocked, what blocked() checks collisions against
+        passable: nav_cell px cells an agent's top left can be in without touching a solid
+        set_target() puts a flow field towards a point on it, sample() reads it for any number of agents.
+        """
+        self.width = width
+        self.cell = cell
+        self.nav_cell = nav_cell
+        self.mask = np.zeros((-(-1080 // cell), -(-width // cell)), bool)
+        for rect in solids:
+            self.mask[max(0, rect.top // cell):max(0, -(-rect.bottom // cell)), max(0, rect.left // cell):max(0, -(-rect.right // cell))] = True
+
+        # summed-area table, blocked cells under a rect = 4 lookups
+        self.blocked_sum = np.zeros((self.mask.shape[0] + 1, self.mask.shape[1] + 1), np.int32)
+        self.blocked_sum[1:, 1:] = self.mask.cumsum(0).cumsum(1)
+        # sample points along an agent's edge, no further apart than a cell so no wall fits between them
+        self.edge = np.linspace(0, 1, int(np.ceil(max(agent_size) / cell)) + 1, dtype=np.float32)
+
+        rows, cols = -(-1080 // nav_cell), -(-width // nav_cell)
+        cx, cy = np.meshgrid(np.arange(cols), np.arange(rows))
+        corners = np.stack([cx.ravel(), cy.ravel()], axis=1).astype(np.float32) * nav_cell
+        self.passable = self.fits(corners, np.asarray(agent_size, np.float32)).reshape(rows, cols)
+        self.passable_list = self.passable.ravel().tolist() # the BFS indexes this a lot, lists are faster
+        self.target_cell = None
+        self.steps = np.full((rows, cols), -1, np.int32) # BFS steps to the target cell, -1 = too far / unreachable
+        self.flow = np.zeros((rows, cols, 2), np.float32) # unit vector towards the target
+        self.locked = [] # doors that were locked when it was built, see get_nav_grid
+
+    def fits(self, pos, size):
+        """Which rects of size with their top left at pos are inside the level without touching a solid"""
+        rows, cols = self.mask.shape
+        x0, y0 = (pos // self.cell).astype(np.int32).T
+        x1, y1 = ((pos + size - 1) // self.cell + 1).astype(np.int32).T
+        inside = (x0 >= 0) & (y0 >= 0) & (x1 <= cols) & (y1 <= rows)
+        x0, x1 = np.clip(x0, 0, cols), np.clip(x1, 0, cols)
+        y0, y1 = np.clip(y0, 0, rows), np.clip(y1, 0, rows)
+        blocked = self.blocked_sum[y1, x1] - self.blocked_sum[y0, x1] - self.blocked_sum[y1, x0] + self.blocked_sum[y0, x0]
+        return inside & (blocked == 0)
+
+    def blocked(self, pos, size, fx, fy):
+        """
+        Which of the agents at pos would touch a solid or leave the level,
+        fx/fy: where the sample points are on the hitbox (0 = left/top, 1 = right/bottom), shape (agents or 1, points)
+        """
+        cx = ((pos[:, 0, None] + fx * (size[:, 0, None] - 1)) // self.cell).astype(np.int32)
+        cy = ((pos[:, 1, None] + fy * (size[:, 1, None] - 1)) // self.cell).astype(np.int32)
+        rows, cols = self.mask.shape
+        outside = (cx < 0) | (cy < 0) | (cx >= cols) | (cy >= rows)
+        hit = self.mask[np.clip(cy, 0, rows - 1), np.clip(cx, 0, cols - 1)]
+        return (outside | hit).any(axis=1)
+
+    def _cells(self, pos):
+        rows, cols = self.passable.shape
+        cells = (np.asarray(pos) // self.nav_cell).astype(np.int32)
+        return np.clip(cells[..., 0], 0, cols - 1), np.clip(cells[..., 1], 0, rows - 1)
+
+    def set_target(self, pos, max_distance):
+        """Flow field towards pos, up to max_distance px of path. Only recomputed when pos is in another cell"""
+        cx, cy = self._cells(pos)
+        if (int(cx), int(cy), max_distance) == self.target_cell:
+            return
+        self.target_cell = (int(cx), int(cy), max_distance)
+
+        # BFS over the passable cells, diagonals only if both cells beside them are passable (no cutting corners)
+        rows, cols = self.passable.shape
+        passable = self.passable_list
+        steps = [-1] * (rows * cols)
+        start = int(cy) * cols + int(cx)
+        steps[start] = 0
+        limit = max_distance // self.nav_cell
+        todo = collections.deque([start])
+        while todo:
+            i = todo.popleft()
+            step = steps[i]
+            if step >= limit:
+                continue
+            x, y = i % cols, i // cols
+            for dx, dy in NAV_NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < cols and 0 <= ny < rows:
+                    j = ny * cols + nx
+                    if steps[j] < 0 and passable[j] and (not dx or not dy or (passable[y * cols + nx] and passable[ny * cols + x])):
+                        steps[j] = step + 1
+                        todo.append(j)
+        self.steps = np.array(steps, np.int32).reshape(rows, cols)
+
+        # every cell points at its neighbour with the fewest steps. That includes blocked cells next to the path:
+        # an agent pressed against a wall can have its top left in one
+        reached = np.where(self.steps >= 0, self.steps, np.inf)
+        padded = np.pad(reached, 1, constant_values=np.inf)
+        best = reached.copy()
+        self.flow = np.zeros((rows, cols, 2), np.float32)
+        for dx, dy in NAV_NEIGHBOURS:
+            shifted = padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+            closer = shifted < best
+            best = np.where(closer, shifted, best)
+            self.flow[closer] = np.array([dx, dy], np.float32) / np.hypot(dx, dy)
+        beside = (self.steps < 0) & np.isfinite(best)
+        self.steps[beside] = best[beside] + 1
+
+    def sample(self, pos):
+        """(direction, steps) for every agent at pos (top lefts), steps -1 = no path to the target within max_distance"""
+        cx, cy = self._cells(pos)
+        return self.flow[cy, cx], self.steps[cy, cx]
+
+_nav_grids = {} # (level, direction) -> NavGrid
+
+def get_nav_grid(room, solids, furniture_hitboxes, width, agent_size):
+    """
+    Built the first time a room is entered, from its solids and its locked doors (monsters can't get through those),
+    and rebuilt when one of the doors unlocks
+    """
+    locked = [key for key, obj in furniture_hitboxes.items()
+              if key.startswith("door") and not obj[3] and len(obj) > 7 and obj[10] not in taken_items and obj[10] not in used_items]
+    nav = _nav_grids.get(room)
+    if nav is None or nav.locked != locked:
+        nav = _nav_grids[room] = NavGrid(solids + [furniture_hitboxes[key][0] for key in locked], width, agent_size)
+        nav.locked = locked
+    return nav
+
+def forget_rooms(levels=None):
+    """Drop what's cached per room of levels (None = all), after a hot reload changed them. Rebuilt on the next frame"""
+    for cache in (_collision_grids, _nav_grids, monster_system.groups):
+        for room in [room for room in cache if levels is None or room[0] in levels]:
+            del cache[room]
+
 # Flags
 dir_w_avail = True # default
 dir_d_avail = True # default
@@ -1007,6 +2392,10 @@ dir_s_avail = False
 checking_drawer = False
 current_drawer = None
 current_door_avail = False
+portal_surf = None # rebuilt only when answer.txt changes
+portal_answer = None # (content, valid) portal_surf was built for
+portal_request = None # Future of the running server request
+portal_waiting_surf = portal_message("Asking the server...")
 
 # other stuff
 taken_items = []
@@ -1018,6 +2407,131 @@ hidden_notes = [
 ]
 level_list = [0, 1, 2, 3, 4, 5]
 
+# --- Stress test rooms ---
+# python thegame.py --stress[=scale] replaces every room with one generated room, scale 1 is
+# 1000 walls, 100 shelves, 50 doors and 100 notes on a 10000 px wide map, all of it grows linearly with scale.
+# With --bench[=frames] it's played headless and the time of every part of the frame is printed,
+# python bench_stress.py runs that for a few scales side by side.
+stress_scale = parse_flag(sys.argv, "--stress", 1, float)
+
+def generate_stress_room(scale=1, seed=0):
+    """
+    Random room in the same structures build_level/build_furniture/build_items return, plus the notes it needs:
+    {"level": (surface, hitboxes), "furniture": (surface, furniture_hitboxes), "items": (surface, items_hitboxes),
+     "notes": {name: text}, "hidden_notes": [(name, [rect])]}
+    Walls stay out of y 400-800 so the player can walk through the whole map.
+    """
+    rng = random.Random(seed)
+    width = max(1920, int(10000 * scale))
+    walls = int(1000 * scale)
+    shelves = int(100 * scale)
+    doors = int(50 * scale)
+    notes = int(100 * scale)
+
+    level_surface = memory_tracker.track(pg.Surface(to_canvas((width, 1080))), "stress")
+    furniture_surface = memory_tracker.track(pg.Surface(to_canvas((width, 1080)), pg.SRCALPHA), "stress")
+    items_surface = memory_tracker.track(pg.Surface(to_canvas((width, 1080)), pg.SRCALPHA), "stress")
+
+    # floor along the corridor
+    for x in range(0, width, world_width(house_floor_texture)):
+        for y in range(400, 800, world_height(house_floor_texture)):
+            level_surface.blit(house_floor_texture, to_canvas((x, y)))
+
+    hitboxes = {"walls": []}
+    for i in range(walls):
+        w, h = rng.randint(20, 200), rng.randint(20, 200)
+        y = rng.randint(0, 400 - h) if rng.random() < 0.5 else rng.randint(800, 1080 - h)
+        wall = pg.Rect(rng.randint(0, width - w), y, w, h)
+        hitboxes["walls"].append(wall)
+        level_surface.fill((90, 80, 70), pg.Rect(to_canvas(wall.topleft), to_canvas((max(w, RENDER_SCALE), max(h, RENDER_SCALE)))))
+
+    # shelves take turns: key, shelf locked with the previous key, hidden note
+    furniture_hitboxes = {}
+    room_notes = {}
+    room_hidden_notes = []
+    for i in range(shelves):
+        x = i * (width - 200) // max(1, shelves)
+        furniture_surface.blit(bedside_table_1_shelf, to_canvas((x, 320)))
+        shelf = [
+            pg.Rect(x, 320, world_width(bedside_table_1_shelf), world_height(bedside_table_1_shelf)-130),
+            pg.Rect(x + 40, 415, 112, 40),
+            bedside_table_11_shelf,
+            (x, 320),
+            'key',
+            (x + 80, 420),
+            f"s{i}",
+            True
+        ]
+        if i % 3 == 1:
+            shelf[7] = False
+            shelf += ['lock', (x + 90, 420), f"shelf_s{i-1}", f"s{i-1}"]
+        elif i % 3 == 2:
+            name = f"hidden_notes{i}"
+            shelf[4] = 'note'
+            shelf += ['none', 'none', 'none', 'none', 'w', note_item, name]
+            room_notes[name] = f"Hidden note {i} of the stress room."
+            room_hidden_notes.append((name, [pg.Rect(x - 25, 320, 250, 200)]))
+        furniture_hitboxes[f"shelf_s{i}"] = shelf
+
+    # every other door is locked with one of the shelf keys, all of them lead back into this room
+    key_shelves = list(range(0, shelves, 3))
+    for i in range(doors):
+        x = 50 + i * (width - 300) // max(1, doors)
+        furniture_surface.blit(door_image, to_canvas((x, 230)))
+        door = [
+            pg.Rect(x - 50, 180, world_width(door_image)+100, world_height(door_image)+100),
+            door_opened_image,
+            (x, 230),
+            True,
+            f"d{i}",
+            'door',
+            current_level
+        ]
+        if i % 2 and key_shelves:
+            key = rng.choice(key_shelves)
+            door[3] = False
+            door += ['lock', (x + 110, 325), f"shelf_s{key}", f"s{key}"]
+        furniture_hitboxes[f"door_s{i}"] = door
+
+    items_hitboxes = {}
+    for i in range(notes):
+        x, y = rng.randint(0, width - 250), rng.randint(420, 780 - world_height(note_item))
+        items_surface.blit(note_item, to_canvas((x, y)))
+        name = f"item_note_s{i}"
+        items_hitboxes[name] = [pg.Rect(x - 130, y - 80, 250, 200)]
+        room_notes[name] = f"Note {i} of the stress room."
+
+    surface_pool.pin(level_surface, furniture_surface, items_surface)
+    return {
+        "level": (level_surface, hitboxes),
+        "furniture": (furniture_surface, furniture_hitboxes),
+        "items": (items_surface, items_hitboxes),
+        "notes": room_notes,
+        "hidden_notes": room_hidden_notes
+    }
+
+if stress_scale:
+    stress_room = generate_stress_room(stress_scale)
+    print(f"Stress room: {len(stress_room['level'][1]['walls'])} walls, {len(stress_room['furniture'][1])} furniture, "
+          f"{len(stress_room['items'][1])} items, {world_width(stress_room['level'][0])} px wide")
+    for name, text in stress_room["notes"].items():
+        stress_note = Note(screen, text)
+        for notes_by_name in (items_with_notesW, items_with_notesD, items_with_notesS, items_with_notesA):
+            notes_by_name[name] = stress_note
+    hidden_notes += stress_room["hidden_notes"]
+
+    hot_reloader.functions = () # --dev still reloads sprites, the generated room has no source to reload
+    # the room layers are built once, items_hitboxes gets hidden notes added so every frame gets a fresh dict
+    def build_level(current_level, current_direction):
+        return stress_room["level"]
+
+    def build_furniture(direction, current_level):
+        return stress_room["furniture"]
+
+    def build_items(direction, current_level):
+        items_surface, items_hitboxes = stress_room["items"]
+        return items_surface, dict(items_hitboxes)
+
 # --- Player state ---
 player_x, player_y = 900, 480
 player_speed = 300
@@ -1025,28 +2539,339 @@ player_upM = player_downM = player_leftM = player_rightM = False
 player_flipped = False
 reached_edge_up = reached_edge_left = reached_edge_down = reached_edge_right = False
 
+# --- Save / load ---
+# file = SAVE_HEADER + zlib(STATE_STRUCT + id table + item lists + hidden notes)
+# strings (item ids, note names) are stored once in the id table and referenced by u16 index
+
+SAVE_PATH = "./savegame.bin"
+SAVE_MAGIC = b"TLGS"
+SAVE_VERSION = 1
+SAVE_HEADER = struct.Struct("<4sH")        # magic, version
+STATE_STRUCT = struct.Struct("<bcBffii")   # level, direction, dir flags, player x/y, level x/y
+COUNT = struct.Struct("<I")
+RECT = struct.Struct("<iiii")
+AUTOSAVE_INTERVAL = 30000 # ms
+
+def snapshot_state():
+    """Immutable copy of the game progress, cheap enough to take on the main thread every frame"""
+    return (
+        current_level,
+        current_direction,
+        (dir_w_avail, dir_d_avail, dir_a_avail, dir_s_avail),
+        player_x, player_y,
+        level_x, level_y,
+        tuple(taken_items),
+        tuple(used_items),
+        tuple((name, tuple(tuple(r) for r in rects)) for name, rects in hidden_notes)
+    )
+
+def pack_state(state):
+    level, direction, dirs, px, py, lx, ly, taken, used, notes = state
+    flags = sum(1 << i for i, avail in enumerate(dirs) if avail)
+
+    ids = sorted(set(taken) | set(used) | {name for name, rects in notes})
+    index = {name: i for i, name in enumerate(ids)}
+
+    out = [STATE_STRUCT.pack(level, direction.encode(), flags, px, py, int(lx), int(ly))]
+
+    out.append(COUNT.pack(len(ids)))
+    for name in ids:
+        raw = name.encode("utf-8")
+        out.append(struct.pack("<B", len(raw)) + raw)
+
+    for items in (taken, used):
+        out.append(COUNT.pack(len(items)))
+        out.append(struct.pack(f"<{len(items)}H", *(index[i] for i in items)))
+
+    out.append(COUNT.pack(len(notes)))
+    for name, rects in notes:
+        out.append(struct.pack("<HH", index[name], len(rects)))
+        out.extend(RECT.pack(*r) for r in rects)
+
+    return b"".join(out)
+
+def unpack_state(data):
+    level, direction, flags, px, py, lx, ly = STATE_STRUCT.unpack_from(data, 0)
+    offset = STATE_STRUCT.size
+
+    def count():
+        nonlocal offset
+        (n,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        return n
+
+    ids = []
+    for _ in range(count()):
+        length = data[offset]
+        ids.append(data[offset+1:offset+1+length].decode("utf-8"))
+        offset += 1 + length
+
+    item_lists = []
+    for _ in range(2):
+        n = count()
+        item_lists.append(tuple(ids[i] for i in struct.unpack_from(f"<{n}H", data, offset)))
+        offset += 2 * n
+
+    notes = []
+    for _ in range(count()):
+        name_i, n = struct.unpack_from("<HH", data, offset)
+        offset += 4
+        rects = []
+        for _ in range(n):
+            rects.append(RECT.unpack_from(data, offset))
+            offset += RECT.size
+        notes.append((ids[name_i], tuple(rects)))
+
+    dirs = tuple(bool(flags & (1 << i)) for i in range(4))
+    return (level, direction.decode(), dirs, px, py, lx, ly, item_lists[0], item_lists[1], tuple(notes))
+
+def write_save(state, path=SAVE_PATH):
+    data = SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION) + zlib.compress(pack_state(state))
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path) # never leave a half written save behind
+
+def read_save(path=SAVE_PATH):
+    """Returns a state tuple like snapshot_state(), or None if there is no usable save"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as err:
+        print(f"Ignoring save {path}: {err}")
+        return None
+
+    try:
+        magic, version = SAVE_HEADER.unpack_from(data, 0)
+        if magic != SAVE_MAGIC or version != SAVE_VERSION:
+            print(f"Ignoring save {path}: unsupported format {magic!r} v{version}")
+            return None
+        return unpack_state(zlib.decompress(data[SAVE_HEADER.size:]))
+    except (struct.error, zlib.error, ValueError, IndexError) as err:
+        # truncated or corrupt (e.g. the game was killed mid-write on a filesystem without atomic rename)
+        print(f"Ignoring save {path}: damaged ({err!r})")
+        return None
+
+def apply_state(state):
+    """Restore progress, the room itself is rebuilt from current_level/current_direction by the loop"""
+    global current_level, current_direction, dir_w_avail, dir_d_avail, dir_a_avail, dir_s_avail
+    global player_x, player_y, level_x, level_y
+
+    level, direction, dirs, px, py, lx, ly, taken, used, notes = state
+    current_level, current_direction = level, direction
+    dir_w_avail, dir_d_avail, dir_a_avail, dir_s_avail = dirs
+    player_x, player_y, level_x, level_y = px, py, lx, ly
+
+    # mutate in place, other code holds references to these lists
+    taken_items[:] = taken
+    used_items[:] = used
+    hidden_notes[:] = [(name, [pg.Rect(r) for r in rects]) for name, rects in notes]
+
+# --- RewindBuffer class ---
+
+class RewindBuffer:
+    def __init__(self, capacity=60*60*3, keyframe_every=120):
+        """
+        Fixed size ring of per-frame entries (3 minutes at 60 fps by default):
+        every keyframe_every frames a full snapshot_state(), otherwise a tuple of (field index, new value) deltas.
+        """
+        self.capacity = capacity
+        self.keyframe_every = keyframe_every
+        self.entries = [None] * capacity
+        self.frame = -1        # last recorded frame
+        self.count = 0
+        self.last = None
+        self.last_signature = None
+
+    @staticmethod
+    def signature():
+        # the loop only appends/pops the item lists, so their lengths are enough to notice inventory changes
+        return (current_level, current_direction, dir_w_avail, dir_d_avail, dir_a_avail, dir_s_avail,
+                player_x, player_y, level_x, level_y, len(taken_items), len(used_items), len(hidden_notes))
+
+    def record(self):
+        """Call once per frame, costs one small tuple compare when nothing changed"""
+        self.frame += 1
+        self.count = min(self.count + 1, self.capacity)
+        is_keyframe = self.frame % self.keyframe_every == 0
+
+        sig = self.signature()
+        changed = sig != self.last_signature
+        if not changed and not is_keyframe:
+            self.entries[self.frame % self.capacity] = ()
+            return
+        self.last_signature = sig
+
+        state = snapshot_state() if changed or self.last is None else self.last
+        if is_keyframe or self.last is None:
+            entry = state
+        else:
+            entry = tuple((i, v) for i, (v, old) in enumerate(zip(state, self.last)) if v != old)
+        self.last = state
+        self.entries[self.frame % self.capacity] = entry
+
+    def oldest_frame(self):
+        """Oldest frame that can still be rebuilt, i.e. the first keyframe still in the ring"""
+        first = self.frame - self.count + 1
+        return first + (-first % self.keyframe_every)
+
+    def state_at(self, frame):
+        keyframe = frame - frame % self.keyframe_every
+        state = list(self.entries[keyframe % self.capacity])
+        for f in range(keyframe + 1, frame + 1):
+            for i, value in self.entries[f % self.capacity]:
+                state[i] = value
+        return tuple(state)
+
+    def step_back(self, frames=1):
+        """Drop the newest frames and return the state to restore, or None when there's nothing older"""
+        target = max(self.frame - frames, self.oldest_frame())
+        if self.count == 0 or target >= self.frame:
+            return None
+
+        state = self.state_at(target)
+        self.count -= self.frame - target
+        self.frame = target
+        self.last = state
+        self.last_signature = None
+        return state
+
+class Autosaver:
+    def __init__(self, path=SAVE_PATH):
+        """Packing, compression and the file write run on a worker thread, only the snapshot is taken on the main thread"""
+        self.path = path
+        self.pending = queue.Queue(maxsize=1)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def save(self, state):
+        # only the newest snapshot matters, drop one that's still waiting
+        try:
+            self.pending.get_nowait()
+        except queue.Empty:
+            pass
+        self.pending.put_nowait(state)
+
+    def _run(self):
+        while True:
+            state = self.pending.get()
+            if state is None:
+                return
+            try:
+                write_save(state, self.path)
+            except OSError as err:
+                print(f"Autosave failed: {err}")
+
+    def close(self):
+        """Write whatever is still queued and stop the worker"""
+        self.pending.put(None)
+        self.thread.join()
+
+if stress_scale:
+    save_path = "./savegame_stress.bin" # stress runs don't touch the real save
+elif memory_tracker.enabled or frame_timer.frames:
+    save_path = "./savegame_test.bin" # neither do soak/memory/bench runs, they play scripted or random input
+else:
+    save_path = SAVE_PATH
+autosaver = Autosaver(save_path)
+rewind = RewindBuffer()
+rewinding = False # hold R
+last_autosave = 0
+last_saved_room = (current_level, current_direction)
+
+# python thegame.py --continue
+if "--continue" in sys.argv:
+    saved_state = read_save(autosaver.path)
+    if saved_state is not None:
+        apply_state(saved_state)
+        last_saved_room = (current_level, current_direction)
+
+# --- RoomProfiler class ---
+
+class RoomProfiler:
+    def __init__(self, out_dir="profiles"):
+        """
+        cProfile that writes one pstats file per room visit, named after (current_level, current_direction).
+        Toggle with F3 or start the game with --profile. Read the files with: python -m pstats profiles/<file>.prof
+        """
+        self.out_dir = out_dir
+        self.enabled = False
+        self.profile = None
+        self.room = None
+        self.visits = {} # room -> how many profiles were written for it
+
+    def _start(self, room):
+        self.room = room
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def _dump(self):
+        self.profile.disable()
+        level, direction = self.room
+        visit = self.visits.get(self.room, 0)
+        self.visits[self.room] = visit + 1
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"room_{level}_{direction}_{visit}.prof")
+        self.profile.dump_stats(path)
+        print(f"Profile written to {path}")
+        self.profile = None
+
+    def toggle(self, room):
+        if self.enabled:
+            self.stop()
+        else:
+            self.enabled = True
+            self._start(room)
+
+    def update(self, room):
+        """Call once per frame, starts a new file whenever the room changes"""
+        if self.enabled and room != self.room:
+            self._dump()
+            self._start(room)
+
+    def stop(self):
+        if self.enabled:
+            self._dump()
+            self.enabled = False
+
+room_profiler = RoomProfiler()
+if "--profile" in sys.argv:
+    room_profiler.toggle((current_level, current_direction))
+
 # --- Game loop ---
 running = True
+frame_count = 0
 while running:
+    frame_count += 1
     # print(current_level)
     # print(player_x)
-    dt = clock.tick(60)
+    dt = clock.tick(0 if frame_timer.frames else 60)
+    frame_start = time.perf_counter()
+    if frame_timer.frames:
+        dt = 16 # benchmark runs uncapped with the same time step every frame
+        frame_timer.bench_input(frame_count)
+    frame_timer.start()
+    room_profiler.update((current_level, current_direction))
+    memory_tracker.update((current_level, current_direction))
+    if memory_tracker.soak_seconds:
+        memory_tracker.soak_input(frame_count)
+    draw_list.clear()
+    # last frame's room layers are replaced below, hand them back to the pool first
+    surface_pool.release(items_surface, furniture_surface, level_surface)
     items_surface, items_hitboxes = build_items(current_direction, current_level)
     furniture_surface, furniture_hitboxes = build_furniture(current_direction, current_level)
     level_surface, hitboxes = build_level(current_level, current_direction)
+    frame_timer.mark("build rooms")
+    job_system.drain()
+    hot_reloader.poll()
     mpos = pg.mouse.get_pos()
 
     # First, put all hidden notes into items_hitboxes
-    for hitbox in hidden_notes:
-        for key, obj in furniture_hitboxes.items():
-            print(obj)
-            if key.startswith("shelf") and len(obj) > 12:
-                if hitbox[0] == obj[14]:
-                    print("executing...")
-                    if checking_drawer:
-                        items_hitboxes[hitbox[0]] = hitbox[1]
-                    else:
-                        items_hitboxes.pop(key, None)
+    scan_hidden_notes(furniture_hitboxes, items_hitboxes, checking_drawer)
+    frame_timer.mark("hidden notes")
 
     # Then handle the drawer check
     for key, obj in furniture_hitboxes.items():
@@ -1080,16 +2905,33 @@ while running:
     
 
         # print(f"Current door: {key}")
+    frame_timer.mark("furniture scan")
 
     # --- Events ---
     for e in pg.event.get():
         if e.type == pg.QUIT:
             running = False
 
+        if e.type == ANSWER_CHANGED and (e.content, e.valid) != portal_answer:
+            portal_surf = None
+
         if e.type == pg.KEYDOWN:
             if e.key == pg.K_ESCAPE:
                 running = False
 
+            if e.key == pg.K_r:
+                rewinding = True
+            if e.key == pg.K_F3:
+                room_profiler.toggle((current_level, current_direction))
+
+            # quicksave / quickload
+            if e.key == pg.K_F5:
+                autosaver.save(snapshot_state())
+            if e.key == pg.K_F9:
+                saved_state = read_save(autosaver.path)
+                if saved_state is not None:
+                    apply_state(saved_state)
+
             # movement keys should only be blocked if ANY note is open
             if current_direction == 'w':
                 if not any(note.check_opened() for note in items_with_notesW.values()):
@@ -1218,42 +3060,27 @@ while running:
             if e.key == pg.K_a: player_leftM = False
             if e.key == pg.K_s: player_downM = False
             if e.key == pg.K_d: player_rightM = False
+            if e.key == pg.K_r: rewinding = False
+    frame_timer.mark("events")
 
-
-    scroll_speed = 5
-    
     # --- Edge checks and scrolling ---
-    reached_edge_right = player_x >= 1460 - player_anim.get_frame().get_width()
+    # the level scrolls in whole pixels at the player's speed
+    step = player_speed * (dt / 1000)
+    scroll_step = round(step)
+    reached_edge_right = player_x >= 1460 - world_width(player_anim.get_frame())
     reached_edge_left  = player_x <= 460
-    reached_edge_down  = player_y >= 470 + player_anim.get_frame().get_height()
+    reached_edge_down  = player_y >= 470 + world_height(player_anim.get_frame())
     reached_edge_up    = player_y <= 240
 
+    scroll_x = scroll_y = 0
     if reached_edge_right and player_rightM:
-        level_x -= scroll_speed
+        scroll_x -= scroll_step
     if reached_edge_left and player_leftM:
-        level_x += scroll_speed
+        scroll_x += scroll_step
     if reached_edge_down and player_downM:
-        level_y -= scroll_speed
+        scroll_y -= scroll_step
     if reached_edge_up and player_upM:
-        level_y += scroll_speed
-
-    # --- Fix player position after scrolling ---
-    player_hitbox = player_anim.get_hitbox(player_x, player_y)
-    for wall in hitboxes["walls"]:
-        moved_wall = wall.move(level_x, level_y)
-        if player_hitbox.colliderect(moved_wall):
-            # Push player out of wall (revert to previous position)
-            # You can store prev_x, prev_y before scrolling for more accuracy
-            # Here, just move player outside the wall on X and Y
-            if player_hitbox.right > moved_wall.left and player_hitbox.left < moved_wall.left:
-                player_x = moved_wall.left - player_hitbox.width
-            elif player_hitbox.left < moved_wall.right and player_hitbox.right > moved_wall.right:
-                player_x = moved_wall.right
-            if player_hitbox.bottom > moved_wall.top and player_hitbox.top < moved_wall.top:
-                player_y = moved_wall.top - player_hitbox.height
-            elif player_hitbox.top < moved_wall.bottom and player_hitbox.bottom > moved_wall.bottom:
-                player_y = moved_wall.bottom
-            player_hitbox = player_anim.get_hitbox(player_x, player_y)
+        scroll_y += scroll_step
 
     # --- Movement ---
     dx = dy = 0
@@ -1265,72 +3092,57 @@ while running:
         dx *= 0.707
         dy *= 0.707
 
-    # --- Collision-aware movement ---
-    prev_x = player_x
-    player_x += dx * player_speed * (dt / 1000)
     player_sprite = player_anim.get_frame()
-    player_x = max(0, min(1920 - player_sprite.get_width(), player_x))
-    player_hitbox = player_anim.get_hitbox(player_x, player_y)
-
-    # check walls
-    for wall in hitboxes["walls"]:
-        moved_wall = wall.move(level_x, level_y)
-        if player_hitbox.colliderect(moved_wall):
-            if dx > 0:
-                player_x = prev_x -10
-            elif dx < 0:
-                player_x = prev_x +10 
-
-            break
-
-    # check furniture
-    # for obj_list in furniture_hitboxes.values():
-    #     for obj in obj_list:
-    #         moved_obj = obj.move(level_x, level_y)
-    #         if player_hitbox.colliderect(moved_obj):
-    #             player_x = prev_x
-    #             break
-
-    for key, obj_list in furniture_hitboxes.items():
-        if key.startswith("shelf"):
-            moved_obj = obj_list[0].move(level_x, level_y)
-            moved_obj1 = obj_list[1].move(level_x, level_y)
-            if player_hitbox.colliderect(moved_obj):
-                player_x = prev_x
-                break
+    move_x = max(0, min(1920 - world_width(player_sprite), player_x + dx * step)) - player_x
+    move_y = max(0, min(1080 - world_height(player_sprite), player_y + dy * step)) - player_y
 
-    prev_y = player_y
-    player_y += dy * player_speed * (dt / 1000)
-    player_y = max(0, min(1080 - player_sprite.get_height(), player_y))
+    # --- Collision-aware movement ---
+    # scrolling moves the level under the player, so both are one motion of the hitbox in level coordinates
     player_hitbox = player_anim.get_hitbox(player_x, player_y)
-
-    # check walls
-    for wall in hitboxes["walls"]:
-        moved_wall = wall.move(level_x, level_y)
-        if player_hitbox.colliderect(moved_wall):
-            if dy > 0:
-                player_y = prev_y -13
-            elif dy < 0:
-                player_y = prev_y
-
-            break
-
-
-    # check furniture
-    # for obj_list in furniture_hitboxes.values():
-    #     for obj in obj_list:
-    #         moved_obj = obj.move(level_x, level_y)
-    #         if player_hitbox.colliderect(moved_obj):
-    #             player_y = prev_y
-    #             break
-
-    for key, obj_list in furniture_hitboxes.items():
-        if key.startswith("shelf"):
-            moved_obj = obj_list[0].move(level_x, level_y)
-            moved_obj1 = obj_list[1].move(level_x, level_y)
-            if player_hitbox.colliderect(moved_obj):
-                player_y = prev_y
-                break
+    level_hitbox = player_hitbox.move(-level_x, -level_y)
+    want_x, want_y = move_x - scroll_x, move_y - scroll_y
+    collision_grid = get_collision_grid((current_level, current_direction), hitboxes, furniture_hitboxes)
+    free_hitbox = push_out(level_hitbox, collision_grid)
+    solids = collision_grid.query(free_hitbox.union(free_hitbox.move(want_x, want_y)).inflate(2, 2))
+    resolved_x, resolved_y = sweep_aabb(free_hitbox, want_x, want_y, solids)
+
+    # split what's left of the motion back into scrolling and player movement, scrolling stays whole pixels.
+    # cut short: the same share of it is scrolled, anything else (pushed out of a wall): the player moves
+    allowed_x, allowed_y = resolved_x - level_hitbox.x, resolved_y - level_hitbox.y
+    if allowed_x != want_x:
+        scroll_x = int(scroll_x * allowed_x / want_x) if want_x and 0 <= allowed_x / want_x <= 1 else 0
+        move_x = allowed_x + scroll_x
+    if allowed_y != want_y:
+        scroll_y = int(scroll_y * allowed_y / want_y) if want_y and 0 <= allowed_y / want_y <= 1 else 0
+        move_y = allowed_y + scroll_y
+    level_x += scroll_x
+    level_y += scroll_y
+    player_x += move_x
+    player_y += move_y
+    player_hitbox = player_anim.get_hitbox(player_x, player_y)
+    frame_timer.mark("collision")
+
+    # --- Monsters ---
+    # caught: back to where you came into the room, and they start over from where they spawned
+    if (current_level, current_direction) != entry_room:
+        entry_room = (current_level, current_direction)
+        entry_position = (player_x, player_y, level_x, level_y)
+    nav_grid = get_nav_grid(entry_room, collision_grid.rects, furniture_hitboxes, world_width(level_surface), monster_system.size)
+    if monster_system.update(dt, entry_room, nav_grid, player_hitbox.move(-level_x, -level_y)):
+        player_x, player_y, level_x, level_y = entry_position
+        player_hitbox = player_anim.get_hitbox(player_x, player_y)
+        del monster_system.groups[entry_room]
+    frame_timer.mark("monsters")
+
+    # --- Particles ---
+    if (current_level, current_direction) != particle_room:
+        particle_room = (current_level, current_direction)
+        particles.clear()
+        open_doors.clear()
+    if "portal" in furniture_hitboxes:
+        particles.emit_rate(PORTAL_RATE, dt, furniture_hitboxes["portal"][0].center, **PORTAL_PARTICLES)
+    particles.update(dt)
+    frame_timer.mark("particles")
 
     # open up that drawer
     for key, obj in furniture_hitboxes.items():
@@ -1365,7 +3177,7 @@ while running:
                 # That's like blitting the lock image if the item is not used
                 if binded_item_id not in used_items and lock_name == 'lock':
                     # print('blitting the lock in drawer logic')
-                    items_surface.blit(lock, lock_pos)
+                    draw_list.add(lock, lock_pos, LAYER_ITEMS)
 
                 # This one is checking if the item was taken, so the drawer can be opened.
                 if binded_item_id in taken_items:
@@ -1375,7 +3187,7 @@ while running:
             if mouse_collision and item_availability and item_id not in used_items:
                 checking_drawer = True
 
-                if item_id not in taken_items and item_name == 'key': items_surface.blit(key_image, item_pos)
+                if item_id not in taken_items and item_name == 'key': draw_list.add(key_image, item_pos, LAYER_ITEMS)
 
                 if item_name == 'note': 
                     direction = obj[12]
@@ -1399,14 +3211,16 @@ while running:
                         if i[0] == note_link:
                             note_hitbox = i[1]
                             
-                    items_surface.blit(note_image, item_pos)
+                    draw_list.add(note_image, item_pos, LAYER_ITEMS)
 
                     if direction == 'w' and f"hidden_note{item_id}" not in items_hitboxes:
                         items_with_notesW[f"hidden_note{item_id}"] = note_instance
-                        hidden_notes.append((f"hidden_note{item_id}", note_hitbox))
+                        # items_hitboxes is rebuilt every frame, don't add the same note to hidden_notes every frame too
+                        if not any(name == f"hidden_note{item_id}" for name, rects in hidden_notes):
+                            hidden_notes.append((f"hidden_note{item_id}", note_hitbox))
                         items_hitboxes[f"hidden_note{item_id}"] = note_hitbox
 
-                furniture_surface.blit(opened_image, opened_image_pos)
+                draw_list.add(opened_image, opened_image_pos, LAYER_FURNITURE)
                 if player_hitbox.colliderect(obj_moved):
                     if item_name == 'key' or item_name == 'lock':
                         if item_id not in taken_items:
@@ -1439,22 +3253,58 @@ while running:
                             door_availability = True
 
                         if binded_item_id not in taken_items and binded_item_id not in used_items and not door_availability:
-                            items_surface.blit(lock, lock_pos)
+                            draw_list.add(lock, lock_pos, LAYER_ITEMS)
 
                 if player_hitbox.colliderect(door_hitbox.move(level_x, level_y)) and door_availability:
-                    furniture_surface.blit(opened_door_image, opened_door_pos)
+                    draw_list.add(opened_door_image, opened_door_pos, LAYER_FURNITURE)
+                    if key not in open_doors:
+                        open_doors.add(key)
+                        door_rect = pg.Rect(opened_door_pos, (world_width(opened_door_image), world_height(opened_door_image)))
+                        particles.emit(DOOR_BURST, door_rect.midbottom, **DOOR_PARTICLES)
+                else:
+                    open_doors.discard(key)
+    frame_timer.mark("drawers/doors")
+
+    # --- Rewind ---
+    if rewinding:
+        rewound_state = rewind.step_back(2)
+        if rewound_state is not None:
+            apply_state(rewound_state)
+    else:
+        rewind.record()
 
     # --- Update animation ---
-    player_anim.update(dt)
-    player_walk_anim.update(dt)
+    player_moving = player_upM or player_leftM or player_downM or player_rightM
+    animation_system.set_visible(player_anim, not player_moving)
+    animation_system.set_visible(player_walk_anim, player_moving)
+    animation_system.update(dt, (current_level, current_direction))
+    frame_timer.mark("rewind/anim")
 
     # --- Draw ---
-    screen.fill((0, 0, 0))
-    screen.blit(level_surface, (level_x, level_y))
-    screen.blit(furniture_surface, (level_x, level_y))
-    screen.blit(items_surface, (level_x, level_y))
-    current_anim = player_walk_anim if (player_upM or player_leftM or player_downM or player_rightM) else player_anim
-    current_anim.draw(screen, player_x, player_y, flip_x=player_flipped)
+    canvas.fill((0, 0, 0))
+    level_pos = to_canvas((level_x, level_y))
+    canvas.blit(level_surface, level_pos)
+    canvas.blit(furniture_surface, level_pos)
+    draw_list.draw(canvas, (level_x, level_y), LAYER_FURNITURE)
+    canvas.blit(items_surface, level_pos)
+    monster_system.draw(canvas, (current_level, current_direction), (level_x, level_y))
+    draw_list.draw(canvas, (level_x, level_y))
+    current_anim = player_walk_anim if player_moving else player_anim
+    current_anim.draw(canvas, player_x, player_y, flip_x=player_flipped)
+    frame_timer.mark("draw world")
+    particles.draw(canvas, (level_x, level_y), 1 / RENDER_SCALE)
+    frame_timer.mark("particles")
+    if current_level in glitch_levels:
+        # only the room itself (what its walls span), a new glitch frame every 50 ms
+        room_area = hitboxes["walls"][0].unionall(hitboxes["walls"][1:])
+        glitch_effect.apply(canvas, pg.Rect(to_canvas((room_area.x + level_x, room_area.y + level_y)), to_canvas(room_area.size)),
+                            pg.time.get_ticks() // 50)
+        frame_timer.mark("glitch")
+    if canvas is not screen:
+        pg.transform.scale(canvas, screen.get_size(), screen)
+    frame_timer.mark("upscale")
+
+    # UI is drawn at full resolution on top of the world
     draw_debug_hitboxes()
     if current_direction == 'w':
         for note in items_with_notesW.values():
@@ -1478,11 +3328,53 @@ while running:
         if key == "portal":
             portal_hitbox = obj[0]
             if player_hitbox.colliderect(portal_hitbox.move(level_x, level_y)):
-                req_text = get_data_from_server()
-                portal_surf = portal_logic(True, req_text)
-                portal_rect = portal_surf.get_rect(midtop=(screen.get_width() // 2, 0))
-                screen.blit(portal_surf, portal_rect)
+                answer_watcher.poll()
+                if portal_surf is None and portal_request is None and answer_watcher.loaded:
+                    portal_answer = (answer_watcher.content, answer_watcher.valid)
+                    portal_request = job_system.submit(get_data_from_server, answer_request_text(),
+                                                       on_done=lambda future, answer=portal_answer: portal_data_received(future, answer))
+                shown_surf = portal_surf or portal_waiting_surf
+                portal_rect = shown_surf.get_rect(midtop=(screen.get_width() // 2, 0))
+                screen.blit(shown_surf, portal_rect)
+    frame_timer.mark("draw ui")
+
+    # autosave on room change and every AUTOSAVE_INTERVAL ms
+    now = pg.time.get_ticks()
+    if (current_level, current_direction) != last_saved_room or now - last_autosave >= AUTOSAVE_INTERVAL:
+        autosaver.save(snapshot_state())
+        last_saved_room = (current_level, current_direction)
+        last_autosave = now
+
+    # soak test: sample memory and containers, stop after soak_seconds
+    if memory_tracker.soak_seconds and frame_count % memory_tracker.sample_every == 0:
+        memory_tracker.soak_sample(now, {
+            "hidden_notes": hidden_notes, "taken_items": taken_items, "used_items": used_items,
+            "glyph_atlases": _glyph_atlases, "open_notes_bodies": _open_notes_bodies
+        })
+        if now >= memory_tracker.soak_seconds * 1000:
+            running = False
+    if frame_timer.frames and frame_count >= frame_timer.frames:
+        running = False
+
+    # deferred work gets what's left of the frame
+    task_scheduler.run(FRAME_BUDGET - TASK_MARGIN - (time.perf_counter() - frame_start) * 1000)
+    frame_timer.mark("tasks")
 
     pg.display.flip()
+    frame_timer.mark("flip")
 
+room_profiler.stop()
+autosaver.save(snapshot_state())
+autosaver.close()
+job_system.close()
 pg.quit()
+
+if frame_timer.frames:
+    frame_timer.report()
+
+if memory_tracker.soak_seconds:
+    soak_failures = memory_tracker.soak_result()
+    for failure in soak_failures:
+        print(f"[soak] FAIL: {failure}")
+    print(f"[soak] {'failed' if soak_failures else 'passed'} after {len(memory_tracker.samples)} samples")
+    sys.exit(1 if soak_failures else 0)